@@ -1,45 +1,98 @@
-from src.arbitrage.arbitrage_manager import ArbitrageManager
 import atexit
+import os
 import signal
-import sys
+import threading
+
+# 标准错误输出的文件描述符（os.write 不经过 sys.stdout 锁，关闭阶段也可安全使用）
+_STDERR = 2
+
+def _write_stderr(message: str) -> None:
+    """直接写入标准错误输出"""
+    try:
+        os.write(_STDERR, (message + "\n").encode("utf-8", "replace"))
+    except OSError:
+        pass
 
 def main():
     arbitrage_manager = None
-    
+    # 收到信号后置位事件，关闭流程由监控循环退出后在正常上下文中执行
+    shutdown_event = threading.Event()
+    # 关闭协调状态：shutdown_system 只执行一次（main 退出前调用，atexit 兜底）
+    shutdown_lock = threading.Lock()
+    shutdown_state = {'done': False, 'reason': None, 'is_error': False}
+
+    def request_shutdown(reason: str, is_error: bool = False) -> None:
+        """记录关闭原因（仅保留第一次请求）"""
+        if shutdown_state['reason'] is None:
+            shutdown_state['reason'] = reason
+            shutdown_state['is_error'] = is_error
+
+    # 信号唤醒管道：信号处理器只写入一个字节，由监听线程在普通上下文中置位事件
+    # （处理器直接调用 Event.set() 需要获取事件内部的锁，主线程恰好在 wait() 中持有该锁时会死锁）
+    wake_r, wake_w = os.pipe()
+
     def signal_handler(signum, frame):
         """处理信号退出"""
-        if arbitrage_manager:
-            signal_name = "SIGINT" if signum == signal.SIGINT else f"SIGNAL-{signum}"
-            arbitrage_manager.shutdown_system(f"接收到{signal_name}信号", False)
-        sys.exit(0)
-    
+        signal_name = "SIGINT" if signum == signal.SIGINT else f"SIGNAL-{signum}"
+        request_shutdown(f"接收到{signal_name}信号")
+        try:
+            os.write(wake_w, b"\0")
+        except OSError:
+            pass
+
+    def wake_listener():
+        """等待信号唤醒后置位关闭事件"""
+        try:
+            os.read(wake_r, 1)
+        except OSError:
+            return
+        shutdown_event.set()
+
+    threading.Thread(target=wake_listener, name="signal-wake", daemon=True).start()
+
     def exit_handler():
-        """程序退出时处理"""
-        if arbitrage_manager and not getattr(arbitrage_manager, '_shutdown_called', False):
-            arbitrage_manager.shutdown_system("程序正常退出", False)
-            arbitrage_manager._shutdown_called = True
-    
+        """执行关闭流程（监控循环退出后由 main 直接调用；atexit 仅作兜底，此时线程池等资源可能已被解释器关闭）"""
+        with shutdown_lock:
+            if shutdown_state['done'] or not arbitrage_manager:
+                return
+            shutdown_state['done'] = True
+        arbitrage_manager.shutdown_system(shutdown_state['reason'] or "程序正常退出", shutdown_state['is_error'])
+
     try:
         # 注册信号处理器和退出处理器
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, signal_handler)
         atexit.register(exit_handler)
-        
-        # 初始化套利管理器
-        arbitrage_manager = ArbitrageManager()
-        
-        # 开始监控价格
-        arbitrage_manager.monitor_prices()
-        
+
+        # 信号处理器就绪后再导入（交易所SDK导入耗时较长）
+        from src.arbitrage.arbitrage_manager import ArbitrageManager
+        from src.config import configure_warnings
+        configure_warnings()
+
+        # 初始化套利管理器（构造期间屏蔽信号，避免半初始化状态下退出）
+        # Windows 不支持 pthread_sigmask（MT5 仅支持 Windows），此时直接构造
+        if hasattr(signal, 'pthread_sigmask'):
+            old_mask = signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGINT, signal.SIGTERM})
+            try:
+                arbitrage_manager = ArbitrageManager()
+            finally:
+                signal.pthread_sigmask(signal.SIG_SETMASK, old_mask)
+        else:
+            arbitrage_manager = ArbitrageManager()
+
+        # 开始监控价格（收到信号后循环退出）
+        arbitrage_manager.monitor_prices(shutdown_event)
+
     except KeyboardInterrupt:
-        print("\n⌨️ 程序被用户中断")
-        if arbitrage_manager:
-            arbitrage_manager.shutdown_system("用户键盘中断", False)
+        _write_stderr("\n⌨️ 程序被用户中断")
+        request_shutdown("用户键盘中断")
     except Exception as e:
-        print(f"❌ 程序发生错误: {e}")
-        if arbitrage_manager:
-            arbitrage_manager.shutdown_system(f"程序异常: {str(e)[:100]}", True)
+        _write_stderr("❌ 程序发生错误: " + str(e)[:200])
+        request_shutdown(f"程序异常: {str(e)[:100]}", True)
         raise
+    finally:
+        # 在解释器开始清理之前完成关闭（发送剩余通知、关闭通知等）
+        exit_handler()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,20 +1,113 @@
 from ..exchanges.binance_client import BinanceClient
 from ..exchanges.okx_client import OKXClient
+from ..exchanges.xau_adapter import XAUAdapter, OKXAdapter, MT5Adapter
 from ..config import Config
-from ..dingtalk_notifier import DingTalkNotifier
+from ..dingtalk_notifier import DingTalkNotifier, DingTalkQueue
 from ..trading_time import trading_time_manager, is_trading_time, wait_until_trading_time
+from ..jsonl_writer import JsonlWriter
+from ..records import TradeRecord, DiffStatsRecord
+from ..price_feed import PriceFeed
+from ..position_stream import BinancePositionStream
+from ..ws_price_cache import WSPriceCache, parse_binance_ticker
 import time
+import hashlib
 import json
+import math
 import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, Dict, List, Any, Tuple
-from functools import wraps
+from typing import Optional, Dict, List, Any, Tuple, Callable
+from functools import lru_cache, wraps
+from operator import itemgetter
 import logging
+import numpy as np
+from binance.exceptions import BinanceAPIException
+from requests.exceptions import ConnectionError as RequestsConnectionError
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 每轮监控都会读取的配置，导入时绑定为模块常量（配置只在启动时从环境变量加载）
+_DIFF_BUFFER_SIZE = Config.DIFF_BUFFER_SIZE
+_DIFF_LOG_EPSILON = Config.DIFF_LOG_EPSILON
+_DIFF_STATS_FLUSH_INTERVAL = Config.DIFF_STATS_FLUSH_INTERVAL
+_POSITION_CACHE_TTL = Config.POSITION_CACHE_TTL
+_TRADING_STATUS_CACHE_TTL = Config.TRADING_STATUS_CACHE_TTL
+_POSITION_DETAIL_EVERY = Config.POSITION_DETAIL_EVERY
+
+# 开仓方向表，按 diff > 0 查找: (动作描述, 持仓类型, PAXG方向, XAUUSD方向)
+OPEN_ACTIONS = {
+    # PAXG价格高，卖PAXG买XAUUSD
+    True: ("SELL PAXG, LONG XAUUSD", "SHORT_PAXG_LONG_XAU", "SELL", "BUY"),
+    # PAXG价格低，买PAXG卖XAUUSD
+    False: ("BUY PAXG, SHORT XAUUSD", "LONG_PAXG_SHORT_XAU", "BUY", "SELL"),
+}
+
+# 终端单行价格显示模板: (时间, PAXG价格, XAUUSD价格, 价差, 价差范围)
+_STATUS_LINE_FMT = "\r[%s] PAXG: $%.2f | XAUUSD: $%.2f | 价差: %+.2f | 范围: %s"
+
+# 严重错误（网络连接中断 / 交易所API错误），出现后关闭系统
+_SEVERE_ERROR_TYPES = (ConnectionError, RequestsConnectionError, BinanceAPIException)
+# 无法按类型识别的异常（其他SDK包装后抛出）按错误信息匹配
+_SEVERE_ERROR_RE = re.compile(r"ConnectionError|APIError")
+
+def _is_severe_error(e: Exception, message: str) -> bool:
+    """判断异常是否为需要关闭系统的严重错误"""
+    return isinstance(e, _SEVERE_ERROR_TYPES) or _SEVERE_ERROR_RE.search(message) is not None
+
+# Binance持仓显示字段（一次取出，字段缺失时回退到逐个取默认值）
+_BINANCE_POSITION_FIELDS = itemgetter('symbol', 'positionSide', 'positionAmt', 'entryPrice',
+                                      'markPrice', 'unRealizedProfit', 'liquidationPrice')
+
+def _binance_position_fields(pos: Dict[str, Any]) -> Tuple[Any, ...]:
+    """取出Binance持仓的显示字段"""
+    try:
+        return _BINANCE_POSITION_FIELDS(pos)
+    except KeyError:
+        # 持仓推送的快照不含强平价格，此时为 None
+        return (pos.get('symbol', 'N/A'), pos.get('positionSide', 'N/A'), pos.get('positionAmt', 0),
+                pos.get('entryPrice', 0), pos.get('markPrice', 0), pos.get('unRealizedProfit', 0),
+                pos.get('liquidationPrice'))
+
+@lru_cache(maxsize=64)
+def _format_binance_position(index: int, fields: Tuple[Any, ...]) -> str:
+    """格式化Binance持仓日志行（原始字段未变化时直接复用上次结果，不再重复 float 转换）"""
+    # 交易所返回的数值字段本身就是 JSON 字符串（如 "2011.50"），换任何 JSON 解析器都得到 str，
+    # 因此 float 转换无法在解析阶段省掉，只能按原始字段去重
+    symbol, side, size, entry_price, mark_price, unrealized_pnl, liquidation_price = fields
+    liquidation_str = "N/A" if liquidation_price is None else "$%.2f" % float(liquidation_price)
+    return "   [%d] %s %s: %.4f | 开仓价: $%.2f | 标记价: $%.2f | 盈亏: %+.2f | 强平价格: %s" % (
+        index, symbol, side, abs(float(size)), float(entry_price), float(mark_price),
+        float(unrealized_pnl), liquidation_str)
+
+def _binance_position_pnl(pos: Dict[str, Any]) -> float:
+    """Binance持仓的未实现盈亏"""
+    return float(pos.get('unRealizedProfit', 0))
+
+def _sum_pnl(positions: Optional[List[Any]], get_pnl: Callable[[Any], float]) -> float:
+    """汇总持仓盈亏（单个持仓解析失败按0计）"""
+    if not positions:
+        return 0.0
+    
+    # 正常数据直接汇总，只有出现解析错误时才逐个容错处理
+    # （每个交易所通常只有1-2个持仓，fsum 单次C层求和比构造 numpy 数组更快，且结果精确）
+    try:
+        return math.fsum(float(get_pnl(pos)) for pos in positions)
+    except (ValueError, TypeError, AttributeError, KeyError):
+        pass
+    
+    def pnl_or_zero(pos: Any) -> float:
+        try:
+            return float(get_pnl(pos))
+        except (ValueError, TypeError, AttributeError):
+            return 0.0
+    
+    return math.fsum(map(pnl_or_zero, positions))
+
 def safe_execute(func_name: str = "未知操作"):
     """安全执行装饰器"""
     def decorator(func):
@@ -28,6 +121,34 @@ def safe_execute(func_name: str = "未知操作"):
         return wrapper
     return decorator
 
+class _PositionCache:
+    """持仓快照短时缓存（同一轮监控内各处共用一次查询结果）"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+
+    def get(self, key: str, ttl: float, loader: Callable[[], Any]) -> Any:
+        """获取缓存的持仓，过期或不存在时调用 loader 重新查询"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < ttl:
+                return entry[1]
+        value = loader()
+        with self._lock:
+            self._entries[key] = (now, value)
+        return value
+
+    def invalidate(self, *keys: str) -> None:
+        """使指定缓存失效（不传参数时全部失效），开平仓后调用"""
+        with self._lock:
+            if keys:
+                for key in keys:
+                    self._entries.pop(key, None)
+            else:
+                self._entries.clear()
+
 class ArbitrageManager:
     def __init__(self):
         logger.info("🔧 正在初始化交易客户端...")
@@ -35,6 +156,39 @@ class ArbitrageManager:
         # 初始化状态
         self._shutdown_called = False
         self._initialization_success = False
+        self._stop_event = threading.Event()
+        
+        # 并发IO线程池（常驻，避免每次查询创建线程）
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="arb-io")
+        
+        # 持久化状态（已设置的杠杆等），用于跳过重复的设置请求
+        self._state_path = os.path.join(os.path.dirname(Config.TRADE_LOG_FILE) or '.', '.arb_state.json')
+        self._state = self._load_state()
+        
+        # 平仓后计算盈利的后台线程（同一时间只保留一个）
+        self._profit_calc_lock = threading.Lock()
+        self._profit_calc_thread: Optional[threading.Thread] = None
+        
+        # 交易日志与价差统计写入器（常驻句柄，后台线程写入）
+        self._trade_writer = JsonlWriter(Config.TRADE_LOG_FILE, rotate_interval=Config.LOG_ROTATE_INTERVAL)
+        self._diff_stats_writer = JsonlWriter(Config.DIFF_STATS_FILE, rotate_interval=Config.LOG_ROTATE_INTERVAL)
+        
+        # 持仓快照短时缓存
+        self._positions_cache = _PositionCache()
+        
+        # 最近一次获取的Binance余额（收益率计算复用，避免每轮平仓都请求）
+        self._last_binance_balance: Optional[Dict[str, Any]] = None
+        self._last_binance_balance_at = 0.0
+        
+        # WebSocket 价格缓存（启用 USE_WS_PRICES 时创建）
+        self._ws_prices: Optional[WSPriceCache] = None
+        
+        # Binance 持仓推送（启用 USE_WS_POSITIONS 时创建）
+        self._position_stream: Optional[BinancePositionStream] = None
+        
+        # 钉钉通知器与交易通知后台队列（钉钉初始化成功后创建）
+        self.dingtalk_notifier: Optional[DingTalkNotifier] = None
+        self._notify_q: Optional[DingTalkQueue] = None
         
         try:
             # 始终初始化Binance（用于PAXG交易）
@@ -43,26 +197,51 @@ class ArbitrageManager:
                 raise Exception("Binance客户端初始化失败")
             binance_status = "✅ Binance"
             
-            # 根据配置初始化XAUUSD交易所
+            # 根据配置初始化XAUUSD交易所（之后统一通过 self.xau 调用）
             if Config.USE_XAU_OKX:
                 try:
-                    self.okx = OKXClient()
-                    self.mt5 = None  # 不使用MT5
-                    xau_status = "✅ OKX"
+                    self.xau: XAUAdapter = OKXAdapter(OKXClient())
                 except Exception as e:
                     logger.error(f"❌ OKX初始化失败: {e}")
                     raise
             else:
                 try:
                     from ..exchanges.mt5_client import MT5Client
-                    self.mt5 = MT5Client()
-                    if not self.mt5.connected:
+                    mt5_client = MT5Client()
+                    if not mt5_client.connected:
                         raise Exception("MT5客户端连接失败")
-                    self.okx = None  # 不使用OKX
-                    xau_status = "✅ MT5"
+                    self.xau = MT5Adapter(mt5_client)
                 except Exception as e:
                     logger.error(f"❌ MT5初始化失败: {e}")
                     raise
+            xau_status = f"✅ {self.xau.name}"
+            
+            # 订阅行情推送（MT5 无推送接口，XAUUSD 仍通过客户端获取）
+            if Config.USE_WS_PRICES:
+                self._start_ws_prices()
+            if Config.USE_WS_POSITIONS:
+                self._start_position_stream()
+            
+            # 开仓数量在运行期间不变，提前换算（XAUUSD按相同盎司数量换算为张数/手数）
+            self._paxg_qty = Config.PAXG_QUANTITY
+            self._xau_vol = self.xau.volume_from_ounces(self._paxg_qty)
+            self._xau_ounces = self.xau.ounces_from_volume(self._xau_vol)
+            self._xau_vol_desc = self.xau.format_volume(self._xau_vol)
+            # 开平仓阈值与轮询间隔运行期间不变，热路径只读实例属性
+            self._open_diff = Config.MIN_PRICE_DIFF
+            self._close_diff = Config.CLOSE_PRICE_DIFF
+            self._check_interval = Config.PRICE_CHECK_INTERVAL
+            # 开平仓阈值的显示文本（运行期间不变）
+            self._open_diff_str = f"{self._open_diff}"
+            self._close_diff_str = f"{self._close_diff}"
+            
+            # 开平仓通知中运行期间不变的字段，发送时复制后补充实时数据
+            self._open_notify_tpl = {
+                'paxg_quantity': self._paxg_qty,
+                'xau_volume': self._xau_vol,
+                'exchange_type': self.xau.name
+            }
+            self._close_notify_tpl = {'exchange_type': self.xau.name}
             
             # 显示客户端初始化状态
             network_type = "测试网" if Config.USE_TESTNET else "主网"
@@ -74,22 +253,33 @@ class ArbitrageManager:
             except Exception:
                 position_mode = "未知"
             
-            logger.info(f"📡 客户端状态: {binance_status} ({network_type}, {position_mode}) | {xau_status} ({'模拟盘' if Config.USE_TESTNET and self.okx else '实盘' if self.okx else 'XAUUSD'})")
+            logger.info(f"📡 客户端状态: {binance_status} ({network_type}, {position_mode}) | {xau_status} ({self.xau.network_desc})")
             
             # 设置杠杆
             self._initialize_leverage()
             
+            # 并发获取一次账户余额，显示与校验共用
+            binance_balance, xau_balance = self._fetch_account_balances()
+            
             # 显示账户保证金信息
-            self._show_account_balance()
+            self._show_account_balance(binance_balance, xau_balance)
             
             # 校验账户余额
-            self._validate_account_balance()
+            self._validate_account_balance(binance_balance, xau_balance)
+            
+            # 预热价格接口连接，首次监控即可复用长连接
+            try:
+                self.get_prices()
+            except Exception as e:
+                logger.warning(f"⚠️ 价格接口预热失败: {e}")
             
             # 初始化钉钉通知器
-            self.dingtalk_notifier = None
             if Config.USE_DINGTALK:
                 try:
                     self.dingtalk_notifier = DingTalkNotifier()
+                    self._notify_q = DingTalkQueue(self.dingtalk_notifier,
+                                                   batch_window=Config.DINGTALK_BATCH_WINDOW,
+                                                   max_batch=Config.DINGTALK_MAX_BATCH)
                     logger.info("✅ 钉钉通知模块初始化成功")
                 except Exception as e:
                     logger.warning(f"⚠️ 钉钉通知模块初始化失败: {e}")
@@ -102,10 +292,22 @@ class ArbitrageManager:
             self.trade_id = 0
             
             # 价差统计管理
+            # ±inf 初值使首个 tick 自然落入极值更新分支，热路径无需额外的首次判断
             self.max_diff = float('-inf')
             self.min_diff = float('inf')
             self.max_diff_time = None
             self.min_diff_time = None
+            # 价差范围显示文本，只在极值变化时重新格式化
+            self._range_str = self._format_diff_range()
+            
+            # 最近价差环形缓冲区（用于窗口统计），极值变化时按间隔写入文件
+            self._diff_buf = np.empty(_DIFF_BUFFER_SIZE, dtype=np.float64)
+            self._diff_idx = 0
+            self._pending_diff_stats: Optional[Tuple[float, float, float, datetime]] = None
+            self._last_diff_stats_flush = 0.0
+            # 上次写入文件时的极值，新极值超出 DIFF_LOG_EPSILON 才需要再次写入
+            self._logged_max_diff = float('-inf')
+            self._logged_min_diff = float('inf')
             
             # 运行时统计
             self.start_time = datetime.now()
@@ -114,11 +316,18 @@ class ArbitrageManager:
             
             # 交易时间状态跟踪
             self.last_trading_status = None
+            # 交易时间检查结果缓存: (单调时钟, 是否交易时间, 状态描述)
+            self._trading_status_cache: Optional[Tuple[float, bool, str]] = None
+            
+            # 持仓详情显示：持仓与价差未变化时只输出一行摘要
+            self._last_display_sig: Optional[Tuple[Any, ...]] = None
+            self._display_summary_count = 0
             
             # 定时推送管理
             self.position_notification_enabled = Config.ENABLE_POSITION_NOTIFICATION
             self.position_notification_times = Config.POSITION_NOTIFICATION_TIMES
             self.last_notification_date = None  # 跟踪最后一次推送的日期，防止重复推送
+            self._notification_minutes = self._parse_notification_times(self.position_notification_times)
             
             # 发送启动通知
             if self.dingtalk_notifier:
@@ -136,52 +345,174 @@ class ArbitrageManager:
             self.shutdown_system(f"初始化失败: {str(e)[:100]}", True)
             raise
     
+    def _parallel(self, *funcs) -> List[Any]:
+        """并发执行多个相互独立的IO调用，按传入顺序返回结果（异常会向上抛出）"""
+        # 最后一个调用直接在当前线程执行，其余提交到线程池，省去一次线程切换
+        futures = [self._io_pool.submit(func) for func in funcs[:-1]]
+        last = funcs[-1]()
+        return [future.result() for future in futures] + [last]
+    
+    def _start_ws_prices(self) -> None:
+        """启动 WebSocket 价格缓存"""
+        if Config.USE_PROXY:
+            logger.warning("⚠️ 行情推送不支持代理，使用 REST 获取价格")
+            return
+        
+        paxg_stream = Config.PAXG_SYMBOL.lower() + "@ticker"
+        binance_ws = "wss://stream.binancefuture.com/ws/" if Config.USE_TESTNET else "wss://fstream.binance.com/ws/"
+        streams = {'paxg': (binance_ws + paxg_stream, None, parse_binance_ticker)}
+        xau_stream = self.xau.ticker_stream()
+        if xau_stream is not None:
+            streams['xau'] = xau_stream
+        
+        ws_prices = WSPriceCache(streams, max_age=Config.WS_PRICE_MAX_AGE)
+        if ws_prices.start():
+            self._ws_prices = ws_prices
+            logger.info(f"📡 行情推送: {', '.join(streams)}")
+    
+    def _start_position_stream(self) -> None:
+        """启动 Binance 持仓推送（OKX 私有频道需登录签名、MT5 无推送接口，XAUUSD 持仓仍通过 REST 获取）"""
+        if Config.USE_PROXY:
+            logger.warning("⚠️ 持仓推送不支持代理，使用 REST 获取持仓")
+            return
+        client = self.binance.client
+        if client is None:
+            return
+        
+        ws_base = "wss://stream.binancefuture.com" if Config.USE_TESTNET else "wss://fstream.binance.com"
+        # 初始快照直接请求 positionRisk（失败时抛出异常重连，不把请求失败当作无持仓）
+        stream = BinancePositionStream(
+            client, Config.PAXG_SYMBOL, ws_base,
+            seed=lambda: client.futures_position_information(symbol=Config.PAXG_SYMBOL)
+        )
+        if stream.start():
+            self._position_stream = stream
+            logger.info("📡 持仓推送: Binance")
+    
+    def _get_binance_positions(self) -> List[Dict[str, Any]]:
+        """获取Binance持仓（优先读取持仓推送快照，否则 POSITION_CACHE_TTL 秒内复用 REST 快照）"""
+        if self._position_stream is not None:
+            positions = self._position_stream.get()
+            if positions is not None:
+                return positions
+        return self._positions_cache.get("binance", _POSITION_CACHE_TTL, self.binance.get_open_positions)
+    
+    def _fetch_positions(self) -> Tuple[List[Dict[str, Any]], List[Any]]:
+        """获取两个交易所的持仓 (Binance持仓, XAUUSD持仓)，需要请求 REST 时并发查询"""
+        if self._position_stream is not None:
+            binance_positions = self._position_stream.get()
+            if binance_positions is not None:
+                # Binance 持仓来自推送快照，只需在当前线程查询 XAUUSD，省去一次线程切换
+                return binance_positions, self._get_xau_positions()
+        binance_positions, xau_positions = self._parallel(self._get_binance_positions, self._get_xau_positions)
+        return binance_positions, xau_positions
+    
+    def _get_xau_positions(self) -> List[Any]:
+        """获取XAUUSD交易所持仓（POSITION_CACHE_TTL 秒内复用快照）"""
+        return self._positions_cache.get(self.xau.name, _POSITION_CACHE_TTL, self.xau.get_open_positions)
+    
+    def _fetch_account_balances(self) -> Tuple[Any, Any]:
+        """并发获取Binance与XAUUSD交易所账户余额（各客户端会输出明细）"""
+        try:
+            binance_balance, xau_balance = self._parallel(self.binance.get_account_balance, self.xau.get_account_balance)
+        except Exception as e:
+            logger.error(f"❌ 获取账户余额失败: {e}")
+            return None, None
+        self._remember_binance_balance(binance_balance)
+        return binance_balance, xau_balance
+    
+    def _remember_binance_balance(self, balance: Optional[Dict[str, Any]]) -> None:
+        """记录最近一次获取的Binance余额"""
+        if balance:
+            self._last_binance_balance = balance
+            self._last_binance_balance_at = time.monotonic()
+    
+    def _load_state(self) -> Dict[str, Any]:
+        """加载持久化状态文件"""
+        try:
+            with open(self._state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"⚠️ 读取状态文件失败，忽略缓存: {e}")
+            return {}
+    
+    def _save_state(self) -> None:
+        """原子写入持久化状态文件"""
+        try:
+            tmp_path = f"{self._state_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._state, f, ensure_ascii=False)
+            os.replace(tmp_path, self._state_path)
+        except Exception as e:
+            logger.warning(f"⚠️ 保存状态文件失败: {e}")
+    
+    @staticmethod
+    def _leverage_state_key(exchange: str, api_key: Optional[str], symbol: str) -> str:
+        """杠杆缓存键（按网络、账户、交易对区分；账户只记录API Key摘要）"""
+        network = 'testnet' if Config.USE_TESTNET else 'live'
+        account = hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:12]
+        return f"{network}:{account}:{symbol}:{exchange}_leverage"
+    
+    def _apply_leverage(self, state_key: str, set_leverage) -> str:
+        """设置单个交易所杠杆，已设置过相同杠杆时跳过请求"""
+        if self._state.get(state_key) == Config.OPEN_LEVEL:
+            return "✅(缓存)"
+        
+        # 先失效缓存，设置成功后再写入
+        self._state.pop(state_key, None)
+        result = set_leverage()
+        if result is None:
+            return "⚠️"
+        self._state[state_key] = Config.OPEN_LEVEL
+        return "✅"
+    
     def _initialize_leverage(self) -> None:
         """初始化时设置期货杠杆"""
         try:
             # 设置Binance杠杆
-            binance_result = self.binance.set_leverage(Config.PAXG_SYMBOL, Config.OPEN_LEVEL)
-            binance_status = "✅" if binance_result is not None else "⚠️"
-            
-            # 如果使用OKX的XAUUSD，也设置OKX杠杆
-            if self.okx:
-                okx_result = self.okx.set_leverage(Config.OKX_XAUUSD_SYMBOL, Config.OPEN_LEVEL)
-                okx_status = "✅" if okx_result is not None else "⚠️"
-                logger.info(f"⚡ 杠杆设置: Binance {binance_status} | OKX {okx_status} ({Config.OPEN_LEVEL}x)")
+            binance_status = self._apply_leverage(
+                self._leverage_state_key('binance', Config.BINANCE_API_KEY, Config.PAXG_SYMBOL),
+                lambda: self.binance.set_leverage(Config.PAXG_SYMBOL, Config.OPEN_LEVEL)
+            )
+            
+            # XAUUSD交易所支持杠杆时（OKX）一并设置
+            if self.xau.supports_leverage:
+                xau_status = self._apply_leverage(
+                    self._leverage_state_key(self.xau.name.lower(), Config.OKX_API_KEY, Config.OKX_XAUUSD_SYMBOL),
+                    lambda: self.xau.set_leverage(Config.OPEN_LEVEL)
+                )
+                logger.info(f"⚡ 杠杆设置: Binance {binance_status} | {self.xau.name} {xau_status} ({Config.OPEN_LEVEL}x)")
             else:
                 logger.info(f"⚡ 杠杆设置: Binance {binance_status} ({Config.OPEN_LEVEL}x)")
                 
         except Exception as e:
             logger.error(f"❌ 杠杆设置失败: {e}")
+        finally:
+            self._save_state()
     
     @safe_execute("显示账户余额")
-    def _show_account_balance(self) -> None:
+    def _show_account_balance(self, binance_balance: Any, xau_balance: Any) -> None:
         """显示所有交易所账户保证金信息"""
         logger.info(f"\n💰 账户余额信息:")
         logger.info("-" * 50)
         
         # 显示Binance合约账户信息
         logger.info("🏢 Binance:")
-        binance_balance = self.binance.get_account_balance()
         if not binance_balance:
             logger.error("   ❌ 获取Binance账户信息失败")
         
         # 显示XAUUSD交易所账户信息
-        if self.okx:
-            logger.info("🏢 OKX:")
-            okx_balance = self.okx.get_account_balance()
-            if not okx_balance:
-                logger.error("   ❌ 获取OKX账户信息失败")
-        elif self.mt5:
-            logger.info("🏢 MT5:")
-            mt5_balance = self.mt5.get_account_balance()
-            if not mt5_balance:
-                logger.error("   ❌ 获取MT5账户信息失败")
+        logger.info(f"🏢 {self.xau.name}:")
+        if not xau_balance:
+            logger.error(f"   ❌ 获取{self.xau.name}账户信息失败")
         
         logger.info("-" * 50)
     
     @safe_execute("校验账户余额")
-    def _validate_account_balance(self) -> None:
+    def _validate_account_balance(self, binance_balance: Any, xau_balance: Any) -> None:
         """校验账户余额是否足够进行套利交易"""
         logger.info(f"🔍 余额校验:")
         
@@ -189,7 +520,6 @@ class ArbitrageManager:
         min_required_balance = 50.0  # 最低要求50 USDT余额作为安全缓冲
         
         # 校验Binance余额
-        binance_balance = self.binance.get_account_balance()
         if binance_balance:
             available = binance_balance.get('available_balance', 0)
             if available >= min_required_balance:
@@ -202,32 +532,17 @@ class ArbitrageManager:
             validation_passed = False
         
         # 校验XAUUSD交易所余额
-        if self.okx:
-            okx_balance = self.okx.get_account_balance()
-            if okx_balance:
-                available = okx_balance.get('available_balance', 0)
-                if available >= min_required_balance:
-                    logger.info(f"   ✅ OKX: {available:.2f} USDT 充足")
-                else:
-                    logger.warning(f"   ❌ OKX: {available:.2f} USDT 不足 (需要≥{min_required_balance:.0f})")
-                    validation_passed = False
-            else:
-                logger.error("   ❌ OKX: 获取余额失败")
-                validation_passed = False
-                
-        elif self.mt5:
-            mt5_balance = self.mt5.get_account_balance()
-            if mt5_balance:
-                available = mt5_balance.get('margin_free', 0)
-                currency = mt5_balance.get('currency', 'USD')
-                if available >= min_required_balance:
-                    logger.info(f"   ✅ MT5: {available:.2f} {currency} 充足")
-                else:
-                    logger.warning(f"   ❌ MT5: {available:.2f} {currency} 不足 (需要≥{min_required_balance:.0f})")
-                    validation_passed = False
+        xau_name = self.xau.name
+        if xau_balance:
+            available, currency = self.xau.get_available_balance(xau_balance)
+            if available >= min_required_balance:
+                logger.info(f"   ✅ {xau_name}: {available:.2f} {currency} 充足")
             else:
-                logger.error("   ❌ MT5: 获取余额失败")
+                logger.warning(f"   ❌ {xau_name}: {available:.2f} {currency} 不足 (需要≥{min_required_balance:.0f})")
                 validation_passed = False
+        else:
+            logger.error(f"   ❌ {xau_name}: 获取余额失败")
+            validation_passed = False
         
         if validation_passed:
             logger.info("   ✅ 余额校验通过，可开始交易")
@@ -235,47 +550,87 @@ class ArbitrageManager:
             logger.warning("   ⚠️ 余额不足，建议充值后交易")
         logger.info("-" * 50)
     
+    def _calculate_total_profit_after_close(self, timeout: Optional[float] = None) -> None:
+        """平仓后计算合计盈利（后台线程执行，不阻塞监控循环）"""
+        timeout = Config.PROFIT_CALC_TIMEOUT if timeout is None else timeout
+        with self._profit_calc_lock:
+            if self._profit_calc_thread is not None and self._profit_calc_thread.is_alive():
+                logger.info("⏳ 已有待执行的盈利计算，跳过")
+                return
+            logger.info(f"\n⏳ 等待持仓清空后计算交易盈利（最长{timeout:.0f}秒）...")
+            thread = threading.Thread(
+                target=self._wait_and_calc_profit,
+                args=(timeout,),
+                name="profit-calc",
+                daemon=True
+            )
+            self._profit_calc_thread = thread
+            thread.start()
+    
+    def _wait_and_calc_profit(self, timeout: float, poll_interval: float = 0.5) -> None:
+        """轮询两个交易所直到持仓清空（成交已回报）或超时，随后计算盈利"""
+        stop_event = self._stop_event
+        deadline = time.monotonic() + timeout
+        while not stop_event.is_set():
+            try:
+                binance_positions, xau_positions = self._parallel(
+                    self.binance.get_open_positions, self.xau.get_open_positions
+                )
+                if not binance_positions and not xau_positions:
+                    break
+            except Exception as e:
+                logger.warning(f"⚠️ 查询平仓结果失败: {e}")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning("⚠️ 等待持仓清空超时，按当前成交记录计算盈利")
+                break
+            stop_event.wait(min(poll_interval, remaining))
+        
+        # 系统关闭时不再计算
+        if stop_event.is_set():
+            return
+        self._do_profit_calc()
+    
+    def _get_binance_balance_quietly(self) -> Optional[Dict[str, Any]]:
+        """获取Binance余额（BALANCE_CACHE_TTL 内复用上次结果），失败时返回 None（只用于收益率显示）"""
+        if (self._last_binance_balance is not None and
+                time.monotonic() - self._last_binance_balance_at < Config.BALANCE_CACHE_TTL):
+            return self._last_binance_balance
+        try:
+            balance = self.binance.get_account_balance()
+        except Exception:
+            return None
+        self._remember_binance_balance(balance)
+        return balance
+    
     @safe_execute("计算交易盈利")
-    def _calculate_total_profit_after_close(self) -> None:
-        """平仓后计算合计盈利"""
+    def _do_profit_calc(self) -> None:
+        """计算并通知本轮套利合计盈利"""
         try:
-            logger.info("\n⏳ 等待10秒后计算交易盈利...")
-            time.sleep(10)
-            
             logger.info("\n📊 计算交易合计盈利:")
             logger.info("-" * 40)
             
             total_profit = 0.0
             total_trades = 0
             
-            # 初始化变量
-            okx_pnl, okx_trades = 0.0, 0
-            mt5_pnl, mt5_trades = 0.0, 0
+            # 并发获取两个交易所最近5分钟的盈利及Binance余额（用于收益率）
+            (binance_pnl, binance_trades), (xau_pnl, xau_trades), binance_balance = self._parallel(
+                lambda: self.binance.calculate_recent_pnl(minutes=5),
+                lambda: self.xau.calculate_recent_pnl(minutes=5),
+                self._get_binance_balance_quietly,
+            )
             
-            # 获取Binance最近5分钟的盈利
-            binance_pnl, binance_trades = self.binance.calculate_recent_pnl(minutes=5)
             logger.info(f"🏢 Binance PAXG:")
             logger.info(f"   交易数量: {binance_trades}")
             logger.info(f"   已实现盈亏: {binance_pnl:+.4f} USDT")
             total_profit += binance_pnl
             total_trades += binance_trades
             
-            # 获取XAUUSD交易所的盈利
-            if self.okx:
-                okx_pnl, okx_trades = self.okx.calculate_recent_pnl(minutes=5)
-                logger.info(f"🏢 OKX XAUUSD:")
-                logger.info(f"   交易数量: {okx_trades}")
-                logger.info(f"   手续费: {okx_pnl:+.4f} USDT")
-                total_profit += okx_pnl
-                total_trades += okx_trades
-                
-            elif self.mt5:
-                mt5_pnl, mt5_trades = self.mt5.calculate_recent_pnl(minutes=5)
-                logger.info(f"🏢 MT5 XAUUSD:")
-                logger.info(f"   交易数量: {mt5_trades}")
-                logger.info(f"   已实现盈亏: {mt5_pnl:+.4f} USD")
-                total_profit += mt5_pnl
-                total_trades += mt5_trades
+            logger.info(f"🏢 {self.xau.name} XAUUSD:")
+            logger.info(f"   交易数量: {xau_trades}")
+            logger.info(f"   {self.xau.pnl_label}: {xau_pnl:+.4f} {self.xau.balance_currency}")
+            total_profit += xau_pnl
+            total_trades += xau_trades
             
             logger.info("-" * 40)
             logger.info(f"💰 本轮套利合计:")
@@ -283,15 +638,11 @@ class ArbitrageManager:
             logger.info(f"   总盈亏: {total_profit:+.4f} USDT")
             
             # 计算年化收益率（基于可用余额）
-            try:
-                binance_balance = self.binance.get_account_balance()
-                if binance_balance:
-                    available_balance = binance_balance.get('available_balance', 100)
-                    if available_balance > 0:
-                        profit_rate = (total_profit / available_balance) * 100
-                        logger.info(f"   收益率: {profit_rate:+.4f}%")
-            except:
-                pass
+            if binance_balance:
+                available_balance = binance_balance.get('available_balance', 100)
+                if available_balance > 0:
+                    profit_rate = (total_profit / available_balance) * 100
+                    logger.info(f"   收益率: {profit_rate:+.4f}%")
                 
             logger.info("-" * 40)
             
@@ -306,13 +657,13 @@ class ArbitrageManager:
                         'total_trades': total_trades,
                         'binance_pnl': binance_pnl,
                         'binance_trades': binance_trades,
-                        'exchange_pnl': okx_pnl if self.okx else mt5_pnl,
-                        'exchange_trades': okx_trades if self.okx else mt5_trades,
-                        'exchange_name': "OKX" if self.okx else "MT5",
+                        'exchange_pnl': xau_pnl,
+                        'exchange_trades': xau_trades,
+                        'exchange_name': self.xau.name,
                         'profit_rate': (total_profit / available_balance * 100) if 'available_balance' in locals() and available_balance > 0 else 0,
                         'timestamp': datetime.now()
                     }
-                    self.dingtalk_notifier.send_arbitrage_profit_notification(profit_data)
+                    self._notify_q.put('profit', profit_data)
                 except Exception as e:
                     logger.warning(f"⚠️ 发送盈利汇总通知失败: {e}")
             
@@ -326,47 +677,79 @@ class ArbitrageManager:
             return
         try:
             self._shutdown_called = True
+            # 唤醒正在等待的监控循环与盈利计算线程（置位后不再计算盈利）
+            self._stop_event.set()
             logger.info(f"\n🛑 正在关闭套利交易系统... 原因: {shutdown_reason}")
             
+            # 各资源独立关闭，某一步失败（或初始化中途失败导致状态不完整）不影响其余资源释放
+            # 先发送队列中剩余的交易通知，保证关闭通知最后到达
+            if self._notify_q:
+                self._shutdown_step("关闭钉钉通知队列", self._notify_q.close)
+            
             # 发送关闭通知
             if self.dingtalk_notifier:
-                try:
-                    runtime_info = {
-                        'start_time': self.start_time,
-                        'total_trades': self.total_trades_count, 
-                        'total_profit': self.total_system_profit,
-                        'max_diff': self.max_diff if self.max_diff != float('-inf') else 0,
-                        'min_diff': self.min_diff if self.min_diff != float('inf') else 0,
-                        'shutdown_reason': shutdown_reason,
-                        'is_error_shutdown': is_error
-                    }
-                    self.dingtalk_notifier.send_system_shutdown_notification(runtime_info)
-                    logger.info("📱 系统关闭通知已发送")
-                except Exception as e:
-                    logger.warning(f"⚠️ 发送关闭通知失败: {e}")
+                self._shutdown_step("发送关闭通知", self._send_shutdown_notification, shutdown_reason, is_error)
+                self._shutdown_step("关闭钉钉通知器", self.dingtalk_notifier.close)
+            
+            # 停止行情与持仓推送
+            if self._ws_prices is not None:
+                self._shutdown_step("停止行情推送", self._ws_prices.stop)
+            if self._position_stream is not None:
+                self._shutdown_step("停止持仓推送", self._position_stream.stop)
+            
+            # 释放并发IO线程池
+            self._shutdown_step("关闭IO线程池", self._io_pool.shutdown, False, cancel_futures=True)
+            
+            # 写入尚未落盘的价差统计，然后写完剩余日志并关闭文件
+            if getattr(self, '_pending_diff_stats', None) is not None:
+                self._shutdown_step("写入价差统计", self._flush_diff_stats)
+            self._shutdown_step("关闭交易日志", self._trade_writer.close)
+            self._shutdown_step("关闭价差统计日志", self._diff_stats_writer.close)
             
             logger.info("✅ 系统已安全关闭")
             
         except Exception as e:
             logger.error(f"❌ 系统关闭过程中发生错误: {e}")
         
+    @staticmethod
+    def _shutdown_step(label: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        """执行单个关闭步骤，失败只记录日志"""
+        try:
+            func(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"❌ {label}失败: {e}")
+    
+    def _send_shutdown_notification(self, shutdown_reason: str, is_error: bool) -> None:
+        """发送系统关闭通知（初始化未完成时统计字段取默认值）"""
+        diff_idx = getattr(self, '_diff_idx', 0)
+        runtime_info = {
+            'start_time': getattr(self, 'start_time', datetime.now()),
+            'total_trades': getattr(self, 'total_trades_count', 0),
+            'total_profit': getattr(self, 'total_system_profit', 0.0),
+            # 尚未记录过价差时极值仍为 ±inf
+            'max_diff': self.max_diff if diff_idx else 0,
+            'min_diff': self.min_diff if diff_idx else 0,
+            'shutdown_reason': shutdown_reason,
+            'is_error_shutdown': is_error
+        }
+        self.dingtalk_notifier.send_system_shutdown_notification(runtime_info)
+        logger.info("📱 系统关闭通知已发送")
+    
     def get_prices(self) -> Tuple[Optional[float], Optional[float]]:
-        """Get PAXG and XAUUSD prices"""
+        """Get PAXG and XAUUSD prices (优先读取推送缓存，缺失或过期的价格通过REST并发查询)"""
         try:
-            paxg_price = self.binance.get_paxg_price()
-            if paxg_price is None:
-                return None, None
-            
-            # 根据初始化的客户端获取XAUUSD价格
-            if self.okx:
-                xauusd_price = self.okx.get_xauusd_price()
-            elif self.mt5:
-                xauusd_price = self.mt5.get_xauusd_price()
-            else:
-                logger.error("❌ 未初始化任何XAUUSD交易所客户端")
-                return None, None
-                
-            if xauusd_price is None:
+            ws_prices = self._ws_prices
+            paxg_price = ws_prices.get('paxg') if ws_prices else None
+            xauusd_price = ws_prices.get('xau') if ws_prices else None
+            
+            if paxg_price is None and xauusd_price is None:
+                paxg_price, xauusd_price = self._parallel(self.binance.get_paxg_price, self.xau.get_price)
+            elif paxg_price is None:
+                paxg_price = self.binance.get_paxg_price()
+            elif xauusd_price is None:
+                xauusd_price = self.xau.get_price()
+            
+            if paxg_price is None or xauusd_price is None:
                 return None, None
                 
             return paxg_price, xauusd_price
@@ -376,158 +759,183 @@ class ArbitrageManager:
 
     def log_trade(self, trade_type: str, action: str, paxg_price: float, xauusd_price: float, 
                   diff: float, binance_position_size: Optional[float] = None, 
-                  xau_volume: Optional[float] = None, profit: Optional[float] = None) -> None:
-        """记录交易到文件"""
+                  xau_volume: Optional[float] = None, profit: Optional[float] = None,
+                  now: Optional[datetime] = None) -> None:
+        """记录交易到文件（now 为监控循环本轮的时间，未传入时取当前时间）"""
         try:
-            trade_record = {
-                "trade_id": self.trade_id,
-                "timestamp": datetime.now().isoformat(),
-                "trade_type": trade_type,  # "OPEN" or "CLOSE" 
-                "action": action,
-                "paxg_price": paxg_price,
-                "xauusd_price": xauusd_price,
-                "price_diff": diff,
-                "binance_position_size": binance_position_size,
-                "xau_volume": xau_volume,  # 通用的XAUUSD仓位大小（手数或USDT）
-                "exchange_type": "OKX" if self.okx else "MT5",  # 记录使用的交易所
-                "profit": profit
-            }
+            trade_record = TradeRecord(
+                self.trade_id, now or datetime.now(), trade_type, action,
+                paxg_price, xauusd_price, diff, binance_position_size,
+                xau_volume, self.xau.name, profit
+            )
             
-            # 写入文件
-            with open(Config.TRADE_LOG_FILE, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(trade_record, ensure_ascii=False) + '\n')
+            # 提交到后台写入
+            self._trade_writer.put(trade_record)
             
         except Exception as e:
             logger.warning(f"⚠️ 记录交易日志失败: {e}")
 
-    def update_diff_stats(self, diff: float, paxg_price: float, xauusd_price: float) -> None:
-        """更新并记录价差统计信息"""
-        current_time = datetime.now()
-        updated = False
+    def update_diff_stats(self, diff: float, paxg_price: float, xauusd_price: float,
+                          now: Optional[datetime] = None, mono: Optional[float] = None) -> None:
+        """
+        更新价差统计信息（极值变化后按间隔写入文件）
         
-        # 更新最大差值
-        if diff > self.max_diff:
-            self.max_diff = diff
-            self.max_diff_time = current_time
-            updated = True
-            
-        # 更新最小差值
-        if diff < self.min_diff:
-            self.min_diff = diff
-            self.min_diff_time = current_time
-            updated = True
-            
-        # 如果有更新，记录到文件
-        if updated:
-            try:
-                stats_record = {
-                    "timestamp": current_time.isoformat(),
-                    "current_diff": diff,
-                    "paxg_price": paxg_price,
-                    "xauusd_price": xauusd_price,
-                    "max_diff": self.max_diff,
-                    "max_diff_time": self.max_diff_time.isoformat() if self.max_diff_time else None,
-                    "min_diff": self.min_diff,
-                    "min_diff_time": self.min_diff_time.isoformat() if self.min_diff_time else None,
-                    "diff_range": self.max_diff - self.min_diff
-                }
-                
-                with open(Config.DIFF_STATS_FILE, 'a', encoding='utf-8') as f:
-                    f.write(json.dumps(stats_record, ensure_ascii=False) + '\n')
-                
-            except Exception as e:
-                logger.warning(f"⚠️ 记录价差统计失败: {e}")
-
-    @safe_execute("开仓操作")
-    def open_position(self, paxg_price: float, xauusd_price: float, diff: float) -> bool:
-        """实际开仓（基于实际持仓检查）"""
-        # 检查是否已有实际持仓
-        binance_positions = self.binance.get_open_positions()
-        if self.okx:
-            xau_positions = self.okx.get_open_positions()
-            exchange_name = "OKX"
-        elif self.mt5:
-            xau_positions = self.mt5.get_open_positions()
-            exchange_name = "MT5"
-        else:
-            logger.error("❌ 未初始化任何XAUUSD交易所客户端")
-            return False
+        Args:
+            now: 监控循环本轮的时间，未传入时取当前时间
+            mono: 监控循环本轮的单调时钟，用于写入间隔计算
+        """
+        # 写入环形缓冲区
+        slot = self._diff_idx % _DIFF_BUFFER_SIZE
+        self._diff_buf[slot] = diff
+        self._diff_idx += 1
         
-        # 如果已有持仓，跳过开仓
-        if binance_positions and len(binance_positions) > 0:
-            logger.warning(f"⚠️ Binance已有{len(binance_positions)}个PAXG持仓，跳过开仓")
-            return False
+        # 绝大多数 tick 落在已知区间内：无新极值，只需检查待写入记录
+        if not self.min_diff <= diff <= self.max_diff:
+            current_time = now or datetime.now()
+            
+            # 更新最大差值（内存中始终精确，超出已写入极值一定幅度才标记待写入）
+            if diff > self.max_diff:
+                self.max_diff = diff
+                self.max_diff_time = current_time
+                if diff >= self._logged_max_diff + _DIFF_LOG_EPSILON:
+                    self._pending_diff_stats = (diff, paxg_price, xauusd_price, current_time)
+            
+            # 更新最小差值（首个 tick 时两个极值同时更新）
+            if diff < self.min_diff:
+                self.min_diff = diff
+                self.min_diff_time = current_time
+                if diff <= self._logged_min_diff - _DIFF_LOG_EPSILON:
+                    self._pending_diff_stats = (diff, paxg_price, xauusd_price, current_time)
+            
+            self._range_str = self._format_diff_range()
         
-        if xau_positions and len(xau_positions) > 0:
-            logger.warning(f"⚠️ {exchange_name}已有{len(xau_positions)}个黄金持仓，跳过开仓")
-            return False
+        # 有未写入的更新且距上次写入已超过间隔时记录到文件
+        if self._pending_diff_stats is None:
+            return
+        if mono is None:
+            mono = time.monotonic()
+        if mono - self._last_diff_stats_flush >= _DIFF_STATS_FLUSH_INTERVAL:
+            self._flush_diff_stats()
+    
+    def _format_diff_range(self) -> str:
+        """格式化价差范围显示文本"""
+        return f"[{self.min_diff:.2f}, {self.max_diff:.2f}]"
+    
+    def get_recent_diff_range(self) -> Tuple[Optional[float], Optional[float]]:
+        """获取环形缓冲区内最近价差的 (最小值, 最大值)"""
+        count = min(self._diff_idx, _DIFF_BUFFER_SIZE)
+        if count == 0:
+            return None, None
+        window = self._diff_buf[:count]
+        return float(window.min()), float(window.max())
+    
+    def _flush_diff_stats(self) -> None:
+        """写入最近一次极值更新时的价差统计记录"""
+        if self._pending_diff_stats is None:
+            return
+        diff, paxg_price, xauusd_price, current_time = self._pending_diff_stats
+        self._pending_diff_stats = None
+        self._last_diff_stats_flush = time.monotonic()
+        self._logged_max_diff = self.max_diff
+        self._logged_min_diff = self.min_diff
+        try:
+            recent_min, recent_max = self.get_recent_diff_range()
+            stats_record = DiffStatsRecord(
+                current_time, diff, paxg_price, xauusd_price,
+                self.max_diff, self.max_diff_time, self.min_diff, self.min_diff_time,
+                self.max_diff - self.min_diff, recent_max, recent_min
+            )
             
+            self._diff_stats_writer.put(stats_record)
+            
+        except Exception as e:
+            logger.warning(f"⚠️ 记录价差统计失败: {e}")
+
+    def open_position(self, paxg_price: float, xauusd_price: float, diff: float,
+                      binance_positions: List[Dict[str, Any]] = None,
+                      xau_positions: List[Any] = None) -> bool:
+        """
+        实际开仓（基于实际持仓检查）
+
+        传入的持仓必须是本轮监控循环获取的快照，不传时重新查询。
+        """
         try:
+            exchange_name = self.xau.name
+            # 未传入持仓时并发查询两个交易所（本轮已查询过则复用缓存）
+            if binance_positions is None or xau_positions is None:
+                binance_positions, xau_positions = self._fetch_positions()
+        
+            # 如果已有持仓，跳过开仓
+            if binance_positions and len(binance_positions) > 0:
+                logger.warning("⚠️ Binance已有%d个PAXG持仓，跳过开仓", len(binance_positions))
+                return False
+        
+            if xau_positions and len(xau_positions) > 0:
+                logger.warning("⚠️ %s已有%d个黄金持仓，跳过开仓", exchange_name, len(xau_positions))
+                return False
+            
             self.trade_id += 1
             
-            # 动态计算仓位大小
-            # Binance: 开0.01盎司PAXG
-            paxg_quantity = Config.PAXG_QUANTITY  # 开仓PAXG数量
+            # 仓位大小已在初始化时换算，只需按实时价格计算PAXG价值
+            paxg_quantity = self._paxg_qty  # 开仓PAXG数量
             binance_position_size_usdt = paxg_quantity * paxg_price  # 用于传给下单函数
-            
-            # XAUUSD交易所仓位大小（根据初始化的客户端）
-            if self.okx:
-                # OKX: 按照相同盎司数量 = 0.01盎司 = 10张 (1张 = 0.001盎司)
-                xau_volume = paxg_quantity * 1000  # 0.01盎司 = 10张
-                volume_unit = "张"
-            elif self.mt5:
-                # MT5: 开0.01手 (0.01手 = 1盎司，最小下单单位)
-                xau_volume = paxg_quantity / 100
-                volume_unit = "手"
-            else:
-                logger.error("❌ 未初始化任何XAUUSD交易所客户端")
+            xau_volume = self._xau_vol
+            
+            action, position_type, paxg_side, xau_action = OPEN_ACTIONS[diff > 0]
+            
+            # 下单前只输出一行，两条腿的明细在提交后输出
+            logger.info("🟢 开始执行套利开仓... 交易ID: %s | 动作: %s | 价差: %.2f", self.trade_id, action, diff)
+            
+            # 两条腿同时下单，执行耗时由两者之和降为两者中的较大值（xau_volume为张数/手数）
+            paxg_order, xau_result = self._parallel(
+                lambda: self._place_leg("Binance PAXG", self.binance.place_paxg_order,
+                                        paxg_side, binance_position_size_usdt),
+                lambda: self._place_leg(f"{exchange_name} XAUUSD", self.xau.place_order,
+                                        xau_action, xau_volume),
+            )
+            
+            # 持仓已变化，丢弃缓存的快照
+            self._positions_cache.invalidate()
+            
+            xau_notional = self._xau_ounces * xauusd_price
+            logger.info("   Binance: %s盎司PAXG (价格$%.2f, 价值$%.2f)",
+                        paxg_quantity, paxg_price, binance_position_size_usdt)
+            logger.info("   %s: %s (价格$%.2f, 价值$%.2f)",
+                        exchange_name, self._xau_vol_desc, xauusd_price, xau_notional)
+            
+            # 下单返回 None 不代表未成交（如请求超时但交易所已受理），以交易所实际持仓为准
+            # （True: 已成交 / False: 确认无持仓 / None: 持仓查询失败，无法确认）
+            paxg_filled = True if paxg_order is not None else \
+                self._leg_has_position("Binance", self.binance.query_open_positions)
+            xau_filled = True if xau_result is not None else \
+                self._leg_has_position(exchange_name, self.xau.query_open_positions)
+            if paxg_order is None and paxg_filled:
+                logger.warning("⚠️ PAXG下单未返回结果，但Binance已有持仓，按已成交处理")
+            if xau_result is None and xau_filled:
+                logger.warning(f"⚠️ {exchange_name} XAUUSD下单未返回结果，但已有持仓，按已成交处理")
+            
+            if paxg_filled is None or xau_filled is None:
+                # 无法确认某一腿是否成交时不做回滚（回滚另一腿可能反而造成裸露持仓）
+                self._alert_manual_handling(
+                    "开仓状态无法确认",
+                    f"交易ID: {self.trade_id}\n"
+                    f"Binance PAXG: {self._leg_state_desc(paxg_filled)}\n"
+                    f"{exchange_name} XAUUSD: {self._leg_state_desc(xau_filled)}\n"
+                    f"持仓查询失败，请人工核对两边持仓")
                 return False
             
-            if diff > 0:
-                # PAXG价格高，卖PAXG买XAUUSD
-                action = "SELL PAXG, LONG XAUUSD"
-                position_type = "SHORT_PAXG_LONG_XAU"
-                paxg_side = "SELL"
-                xau_action = "BUY"
-            else:
-                # PAXG价格低，买PAXG卖XAUUSD  
-                action = "BUY PAXG, SHORT XAUUSD"
-                position_type = "LONG_PAXG_SHORT_XAU"
-                paxg_side = "BUY"
-                xau_action = "SELL"
-            
-            logger.info(f"🟢 开始执行套利开仓...")
-            logger.info(f"   交易ID: {self.trade_id}")
-            logger.info(f"   动作: {action}")
-            logger.info(f"   价差: {diff:.2f}")
-            logger.info(f"   Binance: {paxg_quantity}盎司PAXG (价格${paxg_price:.2f}, 价值${binance_position_size_usdt:.2f})")
-            
-            if self.okx:
-                okx_ounces = xau_volume / 1000  # 张数转换为盎司数
-                logger.info(f"   OKX: {xau_volume:.0f}张黄金 = {okx_ounces:.3f}盎司 (价格${xauusd_price:.2f}, 价值${okx_ounces * xauusd_price:.2f})")
-            elif self.mt5:
-                logger.info(f"   MT5: {xau_volume}手XAUUSD = {xau_volume * 100}盎司 (价格${xauusd_price:.2f}, 价值${xauusd_price * xau_volume * 100:.2f})")
-            
-            # 1. 在Binance执行PAXG交易
-            paxg_order = self.binance.place_paxg_order(paxg_side, binance_position_size_usdt)
-            if paxg_order is None:
-                logger.error("❌ PAXG下单失败，取消套利")
+            # 单腿成交时立即平掉已成交的一腿（开仓前已确认两边均无持仓）
+            if not paxg_filled and not xau_filled:
+                logger.error("❌ 两个交易所下单均失败，取消套利")
                 return False
-                
-            # 2. 在相应交易所执行XAUUSD交易
-            if self.okx:
-                xau_result = self.okx.place_xauusd_order(xau_action.lower(), xau_volume)  # xau_volume是张数
-                exchange_name = "OKX"
-            elif self.mt5:
-                xau_result = self.mt5.place_xauusd_order(xau_action.lower(), xau_volume)  # xau_volume是手数
-                exchange_name = "MT5"
-            else:
-                logger.error("❌ 未初始化任何XAUUSD交易所客户端")
+            if not paxg_filled:
+                logger.error(f"❌ PAXG下单失败，回滚{exchange_name}已成交的XAUUSD持仓")
+                self._rollback_leg(exchange_name, self.xau.query_open_positions, self.xau.close_all_positions)
+                return False
+            if not xau_filled:
+                logger.error(f"❌ {exchange_name} XAUUSD下单失败，回滚已成交的PAXG持仓")
+                self._rollback_leg("Binance", self.binance.query_open_positions, self.binance.close_all_positions)
                 return False
-            
-            if xau_result is None:
-                logger.warning(f"⚠️ {exchange_name} XAUUSD下单可能失败，但PAXG已执行")
-                # 这里在实际环境中应该回滚PAXG交易
                 
             # 记录开仓（不再维护内部状态，完全依赖实际持仓）
             self.position_open = True  # 临时保留，等完全迁移完后可删除
@@ -536,14 +944,10 @@ class ArbitrageManager:
             # 记录开仓
             self.log_trade("OPEN", action, paxg_price, xauusd_price, diff, binance_position_size_usdt, xau_volume)
             
-            logger.info(f"✅ 套利开仓完成!")
-            logger.info(f"   XAUUSD交易: {'成功' if xau_result else '模拟'}")
+            logger.info("✅ 套利开仓完成!")
             
-            if self.okx:
-                okx_ounces = xau_volume / 1000  # 张数转换为盎司数
-                logger.info(f"   实际仓位 - Binance: {paxg_quantity}盎司PAXG(${binance_position_size_usdt:.2f}), OKX: {xau_volume:.0f}张({okx_ounces:.3f}盎司)")
-            elif self.mt5:
-                logger.info(f"   实际仓位 - Binance: {paxg_quantity}盎司PAXG(${binance_position_size_usdt:.2f}), MT5: {xau_volume}手({xau_volume * 100}盎司)")
+            logger.info("   实际仓位 - Binance: %s盎司PAXG($%.2f), %s: %s",
+                        paxg_quantity, binance_position_size_usdt, exchange_name, self._xau_vol_desc)
             
             # 更新系统统计
             self.total_trades_count += 1
@@ -551,18 +955,15 @@ class ArbitrageManager:
             # 发送钉钉开仓通知
             if self.dingtalk_notifier:
                 try:
-                    trade_data = {
-                        'trade_id': self.trade_id,
-                        'action': action,
-                        'paxg_price': paxg_price,
-                        'xauusd_price': xauusd_price,
-                        'price_diff': diff,
-                        'paxg_quantity': paxg_quantity,
-                        'xau_volume': xau_volume,
-                        'exchange_type': "OKX" if self.okx else "MT5",
-                        'timestamp': datetime.now()
-                    }
-                    self.dingtalk_notifier.send_arbitrage_open_notification(trade_data)
+                    # 复制模板（通知队列在后台线程读取，不能共享同一个字典）
+                    trade_data = dict(self._open_notify_tpl,
+                                      trade_id=self.trade_id,
+                                      action=action,
+                                      paxg_price=paxg_price,
+                                      xauusd_price=xauusd_price,
+                                      price_diff=diff,
+                                      timestamp=datetime.now())
+                    self._notify_q.put('open', trade_data)
                 except Exception as e:
                     logger.warning(f"⚠️ 发送开仓通知失败: {e}")
             
@@ -572,27 +973,111 @@ class ArbitrageManager:
             logger.error(f"❌ 开仓失败: {e}")
             return False
 
-    @safe_execute("平仓操作")
-    def close_position(self, paxg_price: float, xauusd_price: float, diff: float) -> bool:
-        """市价全平所有持仓"""
+    @staticmethod
+    def _place_leg(label: str, func: Callable[..., Any], *args) -> Any:
+        """执行单腿下单/平仓，异常时记录并返回 None（不影响另一腿的结果）"""
         try:
-            logger.info(f"🔴 开始执行市价全平...")
-            logger.info(f"   当前价差: {diff:.2f}")
-            
-            # 全平 Binance PAXG 持仓
-            binance_success = self.binance.close_all_positions()
-            
-            # 全平 XAUUSD 持仓
-            xau_success = False
-            if self.okx:
-                xau_success = self.okx.close_all_positions()
-                exchange_name = "OKX"
-            elif self.mt5:
-                xau_success = self.mt5.close_all_positions()
-                exchange_name = "MT5"
-            else:
-                logger.error("❌ 未初始化任何XAUUSD交易所客户端")
-                return False
+            return func(*args)
+        except Exception as e:
+            logger.error(f"❌ {label}执行异常: {e}")
+            return None
+    
+    def _leg_has_position(self, exchange_name: str, query_positions: Callable[[], List[Any]],
+                          attempts: int = 3, delay: float = 0.5) -> Optional[bool]:
+        """
+        下单未返回结果时直接向交易所查询是否已有持仓（成交可能稍后才体现，间隔重试）
+        
+        Returns:
+            True: 已有持仓；False: 查询成功且无持仓；None: 每次查询均失败，无法确认
+        """
+        confirmed = False
+        for attempt in range(attempts):
+            try:
+                if query_positions():
+                    return True
+                confirmed = True
+            except Exception as e:
+                logger.warning(f"⚠️ 查询{exchange_name}持仓失败: {e}")
+            if attempt < attempts - 1 and self._stop_event.wait(delay):
+                break
+        return False if confirmed else None
+    
+    @staticmethod
+    def _leg_state_desc(filled: Optional[bool]) -> str:
+        """单腿成交状态描述"""
+        if filled is None:
+            return "未知（持仓查询失败）"
+        return "已成交" if filled else "未成交"
+    
+    def _rollback_leg(self, exchange_name: str, query_positions: Callable[[], List[Any]],
+                      close_all: Callable[..., bool], attempts: int = 5, delay: float = 0.5) -> bool:
+        """
+        市价平掉单腿成交的持仓，以交易所持仓确认回滚结果
+        
+        已成交的一腿可能稍后才体现在持仓中，查询为空时不能视为已平仓：
+        只有看到持仓并提交平仓后，再次查询为空才算回滚成功；否则间隔重试，最终仍无法确认时告警人工处理。
+        （回滚关系到裸露持仓，系统关闭期间也不提前退出）
+        """
+        close_submitted = False
+        try:
+            for attempt in range(attempts):
+                if attempt:
+                    time.sleep(delay)
+                try:
+                    positions = query_positions()
+                except Exception as e:
+                    logger.warning(f"⚠️ 查询{exchange_name}持仓失败: {e}")
+                    continue
+                if not positions:
+                    if close_submitted:
+                        logger.warning(f"↩️ {exchange_name}单腿持仓已回滚")
+                        return True
+                    # 已成交的一腿尚未体现在持仓中
+                    continue
+                try:
+                    if not close_all(positions):
+                        logger.warning(f"⚠️ {exchange_name}单腿持仓平仓未全部成功，稍后重试")
+                except Exception as e:
+                    logger.warning(f"⚠️ {exchange_name}单腿持仓平仓异常: {e}")
+                close_submitted = True
+        finally:
+            self._positions_cache.invalidate()
+        
+        self._alert_manual_handling(
+            f"{exchange_name}单腿持仓回滚未确认",
+            f"交易ID: {self.trade_id}\n"
+            f"{attempts}次查询后仍无法确认{exchange_name}单腿持仓已平仓，可能存在裸露持仓")
+        return False
+    
+    def _alert_manual_handling(self, title: str, content: str) -> None:
+        """记录错误并通过钉钉告警，需人工处理"""
+        logger.error(f"❌ {title}，请人工处理: {content}")
+        if self.dingtalk_notifier:
+            try:
+                self._notify_q.put('simple', {'title': f"🚨 {title}", 'content': content})
+            except Exception as e:
+                logger.warning(f"⚠️ 发送人工处理告警失败: {e}")
+
+    def close_position(self, paxg_price: float, xauusd_price: float, diff: float,
+                       binance_positions: List[Dict[str, Any]] = None,
+                       xau_positions: List[Any] = None) -> bool:
+        """
+        市价全平所有持仓
+
+        传入的持仓必须是本轮监控循环获取的快照，平仓时不再重复查询；不传时由客户端查询。
+        """
+        try:
+            logger.info("🔴 开始执行市价全平... 当前价差: %.2f", diff)
+            
+            # 同时全平 Binance PAXG 与 XAUUSD 持仓
+            exchange_name = self.xau.name
+            binance_success, xau_success = self._parallel(
+                lambda: self._place_leg("Binance 平仓", self.binance.close_all_positions, binance_positions),
+                lambda: self._place_leg(f"{exchange_name} 平仓", self.xau.close_all_positions, xau_positions),
+            )
+            
+            # 持仓已变化，丢弃缓存的快照
+            self._positions_cache.invalidate()
             
             # 记录平仓（简化版）
             if binance_success or xau_success:
@@ -600,13 +1085,13 @@ class ArbitrageManager:
             
             # 显示结果
             if binance_success and xau_success:
-                logger.info(f"✅ 全平完成! (Binance ✅ | {exchange_name} ✅)")
+                logger.info("✅ 全平完成! (Binance ✅ | %s ✅)", exchange_name)
             elif binance_success:
-                logger.warning(f"⚠️ 部分平仓完成 (Binance ✅ | {exchange_name} ❌)")
+                logger.warning("⚠️ 部分平仓完成 (Binance ✅ | %s ❌)", exchange_name)
             elif xau_success:
-                logger.warning(f"⚠️ 部分平仓完成 (Binance ❌ | {exchange_name} ✅)")
+                logger.warning("⚠️ 部分平仓完成 (Binance ❌ | %s ✅)", exchange_name)
             else:
-                logger.error(f"❌ 平仓失败 (Binance ❌ | {exchange_name} ❌)")
+                logger.error("❌ 平仓失败 (Binance ❌ | %s ❌)", exchange_name)
                 return False
             
             # 重置内部状态
@@ -616,14 +1101,12 @@ class ArbitrageManager:
             # 发送钉钉平仓通知
             if self.dingtalk_notifier:
                 try:
-                    trade_data = {
-                        'paxg_price': paxg_price,
-                        'xauusd_price': xauusd_price,
-                        'price_diff': diff,
-                        'exchange_type': "OKX" if self.okx else "MT5",
-                        'timestamp': datetime.now()
-                    }
-                    self.dingtalk_notifier.send_arbitrage_close_notification(trade_data)
+                    trade_data = dict(self._close_notify_tpl,
+                                      paxg_price=paxg_price,
+                                      xauusd_price=xauusd_price,
+                                      price_diff=diff,
+                                      timestamp=datetime.now())
+                    self._notify_q.put('close', trade_data)
                 except Exception as e:
                     logger.warning(f"⚠️ 发送平仓通知失败: {e}")
             
@@ -635,37 +1118,34 @@ class ArbitrageManager:
 
     def should_close_position(self, diff: float, binance_positions: List[Dict[str, Any]] = None, 
                               xau_positions: List[Any] = None) -> bool:
-        """判断是否应该平仓（基于已获取的持仓信息）"""
+        """
+        判断是否应该平仓（基于已获取的持仓信息）
+
+        传入的持仓必须是本轮监控循环获取的快照，不传时重新查询。
+        """
         # 如果没有传入持仓信息，则获取（向后兼容）
         if binance_positions is None or xau_positions is None:
-            binance_positions = self.binance.get_open_positions()
-            if self.okx:
-                xau_positions = self.okx.get_open_positions()
-            elif self.mt5:
-                xau_positions = self.mt5.get_open_positions()
-            else:
-                xau_positions = []
-        
-        has_positions = (binance_positions and len(binance_positions) > 0) or (xau_positions and len(xau_positions) > 0)
+            binance_positions, xau_positions = self._fetch_positions()
         
-        if not has_positions:
-            return False
-            
-        # 当价差回归到较小范围时平仓
-        return abs(diff) <= Config.CLOSE_PRICE_DIFF
+        # 有任一持仓且价差回归到较小范围时平仓（空列表/None 均视为无持仓）
+        return bool(binance_positions or xau_positions) and -self._close_diff <= diff <= self._close_diff
+
+    def monitor_prices(self, stop_event: Optional[threading.Event] = None) -> None:
+        """Monitor prices and manage positions
 
-    def monitor_prices(self) -> None:
-        """Monitor prices and manage positions"""
+        Args:
+            stop_event: 停止事件，由信号处理器置位，循环在每次间隔等待时检查
+        """
+        stop_event = stop_event or threading.Event()
+        # 保存停止事件，shutdown_system 置位后等待立即结束
+        self._stop_event = stop_event
         if not self._initialization_success:
             logger.error("❌ 系统未成功初始化，无法启动监控")
             return
             
         logger.info("\n🚀 启动套利交易监控系统")
         logger.info("=" * 60)
-        if self.okx:
-            logger.info(f"💰 策略: Binance{Config.PAXG_QUANTITY}盎司PAXG ⇄ OKX(1000张XAUT-USDT=1盎司)")
-        elif self.mt5:
-            logger.info(f"💰 策略: Binance{Config.PAXG_QUANTITY}盎司PAXG ⇄ MT5(1手XAUUSD=100盎司)")
+        logger.info(f"💰 策略: Binance{Config.PAXG_QUANTITY}盎司PAXG ⇄ {self.xau.strategy_desc}")
         logger.info(f"📊 阈值: 开仓±{Config.MIN_PRICE_DIFF:.2f} | 平仓±{Config.CLOSE_PRICE_DIFF:.2f} | 间隔{Config.PRICE_CHECK_INTERVAL}s")
         logger.info(f"⏰ 交易时间校验: {'✅ 启用' if Config.ENABLE_TRADING_TIME_CHECK else '❌ 禁用'}")
         
@@ -690,10 +1170,13 @@ class ArbitrageManager:
                 logger.info(f"⏰ 当前不在交易时间: {trading_status}")
                 logger.info("⏳ 等待交易时间开始...")
                 try:
-                    wait_until_trading_time(60)  # 每60秒检查一次
+                    wait_until_trading_time(3600, stop_event)  # 等待到开盘时刻（最长1小时重新计算）
+                    if stop_event.is_set():
+                        logger.info("⌨️ 接收到停止信号，系统退出")
+                        return
                     logger.info("✅ 交易时间开始，开始监控价格")
-                    # 更新状态并发送开盘通知
-                    self._check_and_notify_trading_status_change()
+                    # 更新状态并发送开盘通知（等待结束后重新检查，不使用缓存）
+                    self._check_and_notify_trading_status_change(use_cache=False)
                 except KeyboardInterrupt:
                     logger.info("⌨️ 用户中断等待，系统退出")
                     return
@@ -706,119 +1189,183 @@ class ArbitrageManager:
         consecutive_errors = 0
         max_consecutive_errors = 5
         
-        while not self._shutdown_called:
+        # 循环内不变的对象提前绑定
+        xau = self.xau
+        xau_exchange_name = xau.name
+        fetch_positions = self._fetch_positions
+        update_diff_stats = self.update_diff_stats
+        display_positions_info = self._display_positions_info
+        check_scheduled_notification = self._check_and_send_scheduled_notification
+        should_close_position = self.should_close_position
+        monotonic = time.monotonic
+        strftime = time.strftime
+        check_interval = self._check_interval
+        open_diff = self._open_diff
+        time_check_enabled = Config.ENABLE_TRADING_TIME_CHECK
+        stdout = sys.stdout
+        status_every = max(1, Config.STATUS_LINE_EVERY)
+        reconcile_every = Config.POSITION_RECONCILE_EVERY
+        # 确认两边均无持仓后经过的轮数，None 表示下一轮需要向交易所查询
+        flat_ticks = None
+        status_tick = 0
+        last_status_zone = None
+        
+        # 价格由后台线程按固定节奏轮询，监控循环只处理最新报价（处理较慢时跳过过期报价）
+        price_feed = PriceFeed(self.get_prices, check_interval, stop_event)
+        price_feed.start()
+        wait_next = price_feed.wait_next
+        price_seq = 0
+        # 价格线程长时间没有新报价（请求挂起）时按获取失败处理
+        quote_timeout = max(check_interval * 3, 30)
+        
+        while not self._shutdown_called and not stop_event.is_set():
             try:
+                # 等待价格线程发布新报价
+                price_seq, quote = wait_next(price_seq, quote_timeout)
+                if stop_event.is_set():
+                    break
+                
+                # 每轮只取一次单调时钟，用于缓存与写入间隔判断；墙上时间只在输出时才获取
+                tick_mono = monotonic()
+                
                 # 检查是否仍在交易时间（如果启用了交易时间校验）
-                if Config.ENABLE_TRADING_TIME_CHECK:
-                    is_trading, trading_status = self._check_and_notify_trading_status_change()
+                if time_check_enabled:
+                    is_trading, trading_status = self._check_and_notify_trading_status_change(mono=tick_mono)
                     if not is_trading:
                         logger.info(f"\n⏰ 进入休市时间: {trading_status}")
                         logger.info("⏳ 等待下次交易时间...")
+                        # 休市期间暂停价格轮询
+                        price_feed.pause()
                         try:
-                            wait_until_trading_time(60)  # 每60秒检查一次
+                            wait_until_trading_time(3600, stop_event)  # 等待到开盘时刻（最长1小时重新计算）
+                            if stop_event.is_set():
+                                break
                             logger.info("✅ 交易时间恢复，继续监控价格")
+                            # 下一轮重新检查交易时间，不使用休市前的缓存
+                            self._trading_status_cache = None
                             # 重置错误计数
                             consecutive_errors = 0
                             continue
                         except KeyboardInterrupt:
                             logger.info("⌨️ 用户中断等待，系统退出")
                             break
+                        finally:
+                            # 从恢复时的序号开始等待，休市前发布的报价不再参与开平仓判断
+                            price_seq = price_feed.resume()
                 
-                paxg_price, xauusd_price = self.get_prices()
+                paxg_price, xauusd_price = quote if quote is not None else (None, None)
                 if paxg_price is None or xauusd_price is None:
                     consecutive_errors += 1
                     if consecutive_errors >= max_consecutive_errors:
                         logger.error(f"❌ 连续{consecutive_errors}次获取价格失败，系统即将关闭")
                         self.shutdown_system(f"连续{consecutive_errors}次获取价格失败", True)
                         break
-                    logger.warning(f"\r⚠️ 获取价格失败，重试中... ({consecutive_errors}/{max_consecutive_errors})")
-                    time.sleep(Config.PRICE_CHECK_INTERVAL)
+                    logger.warning("\r⚠️ 获取价格失败，重试中... (%d/%d)", consecutive_errors, max_consecutive_errors)
                     continue
 
                 # 重置错误计数
                 consecutive_errors = 0
                 
                 diff = paxg_price - xauusd_price
-                current_time = datetime.now().strftime("%H:%M:%S")
                 
                 # 更新价差统计（跟随循环执行）
-                self.update_diff_stats(diff, paxg_price, xauusd_price)
-                
-                     
-                # 简化的价格显示
-                print(f"\r[{current_time}] PAXG: ${paxg_price:.2f} | XAUUSD: ${xauusd_price:.2f} | 价差: {diff:+.2f} | 范围: [{self.min_diff:.2f}, {self.max_diff:.2f}]", end="")
+                update_diff_stats(diff, paxg_price, xauusd_price, None, tick_mono)
                 
-                # 检查是否有持仓
-                binance_positions = self.binance.get_open_positions()
+                # 简化的价格显示（每 status_every 轮刷新一次，价差变号或越过开仓阈值时立即刷新）
+                status_tick += 1
+                status_zone = (diff > 0, diff >= open_diff or diff <= -open_diff)
+                if status_tick >= status_every or status_zone != last_status_zone:
+                    status_tick = 0
+                    last_status_zone = status_zone
+                    stdout.write(_STATUS_LINE_FMT % (strftime('%H:%M:%S'),
+                                                     paxg_price, xauusd_price, diff, self._range_str))
+                    stdout.flush()
                 
-                # 根据初始化的客户端检查黄金持仓
-                if self.okx:
-                    xau_positions = self.okx.get_open_positions()  # 只获取XAUT-USDT持仓
-                    xau_exchange_name = "OKX"
-                elif self.mt5:
-                    xau_positions = self.mt5.get_open_positions()  # 只获取XAUUSD持仓
-                    xau_exchange_name = "MT5"
+                # 检查是否有持仓（Binance与黄金持仓并发查询，只获取PAXG / XAUT-USDT / XAUUSD持仓）
+                # 已确认无持仓时跳过查询，每 reconcile_every 轮核对一次（开仓前 open_position 会重新查询）
+                if flat_ticks is not None and flat_ticks < reconcile_every:
+                    flat_ticks += 1
+                    binance_positions = xau_positions = None
                 else:
-                    xau_positions = []
-                    xau_exchange_name = "未知"
+                    binance_positions, xau_positions = fetch_positions()
+                    flat_ticks = None if (binance_positions or xau_positions) else 0
                 
                 # 如果有持仓，分别显示持仓信息并检查平仓条件
                 if xau_positions or binance_positions:
-                    self._display_positions_info(binance_positions, xau_positions, xau_exchange_name, diff)
+                    display_positions_info(binance_positions, xau_positions, xau_exchange_name, diff)
                      # 检查定时推送
-                    self._check_and_send_scheduled_notification(paxg_price, xauusd_price, diff)
+                    check_scheduled_notification(paxg_price, xauusd_price, diff, None,
+                                                 binance_positions, xau_positions)
           
                     # 检查是否要平仓（使用已获取的持仓信息，避免重复调用API）
-                    should_close = self.should_close_position(diff, binance_positions, xau_positions)
-                    logger.info(f'是否应该平仓: {should_close} (基于已获取持仓判断)')
+                    should_close = should_close_position(diff, binance_positions, xau_positions)
+                    logger.info('是否应该平仓: %s (基于已获取持仓判断)', should_close)
                     
                     if should_close:
                         logger.info("🔄 开始执行平仓...")
-                        if self.close_position(paxg_price, xauusd_price, diff):
+                        # 平仓后下一轮重新查询持仓（可能只平掉一边）
+                        flat_ticks = None
+                        if self.close_position(paxg_price, xauusd_price, diff, binance_positions, xau_positions):
                             logger.info("\n✅ 平仓完成")
-                            # 等待10秒后计算合计盈利
+                            # 持仓清空后在后台计算合计盈利
                             self._calculate_total_profit_after_close()
                     else:
                         logger.info("❌ 平仓跳过: 不满足平仓条件或无实际持仓")
                 
                 # 如果没有持仓，检查开仓条件
                 else:
-                    if abs(diff) >= Config.MIN_PRICE_DIFF:
-                        logger.info(f"\n🎯 满足开仓条件(|{diff:.2f}| >= {Config.MIN_PRICE_DIFF})")
+                    if abs(diff) >= open_diff:
+                        logger.info("\n🎯 满足开仓条件(|%.2f| >= %s)", diff, self._open_diff_str)
                         # 这里可以启用实际开仓：
-                        if self.open_position(paxg_price, xauusd_price, diff):
+                        # 开仓后（包括单腿回滚）下一轮重新查询持仓
+                        flat_ticks = None
+                        if self.open_position(paxg_price, xauusd_price, diff, binance_positions, xau_positions):
                             logger.info("✅ 开仓完成")
 
-                # 简单分隔（不再打印长横线）
-                time.sleep(Config.PRICE_CHECK_INTERVAL)
-
             except KeyboardInterrupt:
                 logger.info(f"\n⌨️ 接收到中断信号，正在停止监控...")
                 self.shutdown_system("用户手动停止", False)
                 break
             except Exception as e:
                 consecutive_errors += 1
-                logger.error(f"\n❌ 监控过程中发生错误: {e}")
+                flat_ticks = None
+                error_msg = str(e)
+                logger.error(f"\n❌ 监控过程中发生错误: {error_msg}")
                 
                 if consecutive_errors >= max_consecutive_errors:
                     logger.error(f"❌ 连续{consecutive_errors}次错误，系统即将关闭")
-                    self.shutdown_system(f"连续{consecutive_errors}次错误: {str(e)[:100]}", True)
+                    self.shutdown_system(f"连续{consecutive_errors}次错误: {error_msg[:100]}", True)
                     break
                     
                 # 如果是严重错误，发送错误关闭通知
-                if "ConnectionError" in str(e) or "APIError" in str(e):
+                if _is_severe_error(e, error_msg):
                     logger.error("检测到严重错误，系统即将关闭...")
-                    self.shutdown_system(f"系统错误: {str(e)[:100]}", True)
+                    self.shutdown_system(f"系统错误: {error_msg[:100]}", True)
                     break
-                time.sleep(Config.PRICE_CHECK_INTERVAL)
     
-    def _check_and_notify_trading_status_change(self) -> Tuple[bool, str]:
-        """检查交易状态变化并发送钉钉通知"""
-        is_trading, trading_status = is_trading_time()
+    def _check_and_notify_trading_status_change(self, use_cache: bool = True,
+                                                now: Optional[datetime] = None,
+                                                mono: Optional[float] = None) -> Tuple[bool, str]:
+        """
+        检查交易状态变化并发送钉钉通知
+        
+        Args:
+            use_cache: 是否复用 TRADING_STATUS_CACHE_TTL 秒内的检查结果
+            now: 通知中显示的时间，未传入时在状态变化时取当前时间
+            mono: 监控循环本轮的单调时钟，用于缓存判断
+        """
+        if mono is None:
+            mono = time.monotonic()
+        cache = self._trading_status_cache
+        if use_cache and cache is not None and mono - cache[0] < _TRADING_STATUS_CACHE_TTL:
+            _, is_trading, trading_status = cache
+        else:
+            is_trading, trading_status = is_trading_time()
+            self._trading_status_cache = (mono, is_trading, trading_status)
         
         # 如果状态发生变化，发送通知
         if self.last_trading_status is not None and self.last_trading_status != is_trading:
-            current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            current_time = (now or datetime.now()).strftime('%Y-%m-%d %H:%M:%S')
             
             if is_trading:
                 # 开盘通知
@@ -831,10 +1378,10 @@ class ArbitrageManager:
                 content = f"时间: {current_time}\n状态: {trading_status}\n系统暂停交易，等待下次开盘"
                 logger.info(f"📉 闭市通知: {trading_status}")
             
-            # 发送钉钉通知
+            # 发送钉钉通知（放入后台队列，不阻塞监控循环）
             if self.dingtalk_notifier:
                 try:
-                    self.dingtalk_notifier.send_simple_message_to_all(title, content)
+                    self._notify_q.put('simple', {'title': title, 'content': content})
                 except Exception as e:
                     logger.warning(f"⚠️ 发送交易状态通知失败: {e}")
         
@@ -845,125 +1392,94 @@ class ArbitrageManager:
     def _display_positions_info(self, binance_positions: List[Dict[str, Any]], 
                                xau_positions: List[Any], xau_exchange_name: str, diff: float) -> None:
         """显示持仓信息"""
-        logger.info(f"\n📊 持仓状态详情:")
-        logger.info("-" * 50)
+        # 未启用INFO日志时跳过全部格式化
+        if not logger.isEnabledFor(logging.INFO):
+            return
         
         # 分别统计各交易所持仓
-        binance_pnl = 0
-        xau_pnl = 0
+        binance_pnl = _sum_pnl(binance_positions, _binance_position_pnl)
+        xau_pnl = _sum_pnl(xau_positions, self.xau.get_position_pnl)
+        
+        # 持仓数量、Binance持仓和价差（保留2位）与上一轮相同时只输出一行摘要，
+        # 每 POSITION_DETAIL_EVERY 轮仍输出一次完整详情
+        sig = (
+            tuple((pos.get('symbol'), pos.get('positionSide'), pos.get('positionAmt')) for pos in binance_positions or ()),
+            len(xau_positions or ()),
+            round(diff, 2)
+        )
+        if sig == self._last_display_sig and self._display_summary_count < _POSITION_DETAIL_EVERY:
+            self._display_summary_count += 1
+            logger.info("📊 持仓未变化 | 价差: %+.2f | 总盈亏: %+.2f USDT (Binance: %+.2f | %s: %+.2f)",
+                        diff, binance_pnl + xau_pnl, binance_pnl, xau_exchange_name, xau_pnl)
+            return
+        self._last_display_sig = sig
+        self._display_summary_count = 0
+        
+        # 详情各行先拼接，最后一次 logger.info 输出（一次加锁、一次写入）
+        separator = "-" * 50
+        lines = ["\n📊 持仓状态详情:", separator]
+        append = lines.append
         
         # 显示Binance PAXG持仓
         if binance_positions:
-            logger.info("🔸 Binance PAXG持仓:")
+            append("🔸 Binance PAXG持仓:")
             for i, pos in enumerate(binance_positions, 1):
                 try:
-                    symbol = pos.get('symbol', 'N/A')
-                    side = pos.get('positionSide', 'N/A')
-                    size = float(pos.get('positionAmt', 0))
-                    entry_price = float(pos.get('entryPrice', 0))
-                    mark_price = float(pos.get('markPrice', 0))
-                    unrealized_pnl = float(pos.get('unRealizedProfit', 0))
-                    liquidation_price = float(pos.get('liquidationPrice', 0))
-                    logger.info(f"   [{i}] {symbol} {side}: {abs(size):.4f} | 开仓价: ${entry_price:.2f} | 标记价: ${mark_price:.2f} | 盈亏: {unrealized_pnl:+.2f} | 强平价格: ${liquidation_price:.2f}")
-                    binance_pnl += unrealized_pnl
+                    append(_format_binance_position(i, _binance_position_fields(pos)))
                 except (ValueError, TypeError) as e:
                     logger.warning(f"   [{i}] 解析Binance持仓数据失败: {e}")
-            logger.info(f"   Binance小计: {binance_pnl:+.2f} USDT")
+            append("   Binance小计: %+.2f USDT" % binance_pnl)
         else:
-            logger.info("🔸 Binance PAXG持仓: 无")
+            append("🔸 Binance PAXG持仓: 无")
         
         # 显示XAUUSD持仓（OKX或MT5）
         if xau_positions:
-            logger.info(f"🔸 {xau_exchange_name} XAUUSD持仓:")
+            append("🔸 %s XAUUSD持仓:" % xau_exchange_name)
+            # 按交易所持仓格式输出（OKX字典 / MT5命名元组），适配器方法在循环外绑定
+            format_position = self.xau.format_position
             for i, pos in enumerate(xau_positions, 1):
                 try:
-                    if self.okx:
-                        # OKX持仓格式
-                        inst_id = pos.get('instId', 'N/A')
-                        side = pos.get('posSide', 'N/A')
-                        size = float(pos.get('pos', 0))
-                        avg_px = float(pos.get('avgPx', 0))
-                        mark_px = float(pos.get('markPx', 0))
-                        upl = float(pos.get('upl', 0))
-                        upl_ratio = float(pos.get('uplRatio', 0)) * 100
-                        
-                        # 将张数转换为盎司显示
-                        size_oz = abs(size) / 1000
-                        logger.info(f"   [{i}] {inst_id} {side}: {abs(size):.0f}张({size_oz:.3f}盎司) | 开仓价: ${avg_px:.2f} | 标记价: ${mark_px:.2f} | 盈亏: {upl:+.2f} | ROE: {upl_ratio:+.2f}%")
-                        xau_pnl += upl
-                    elif self.mt5:
-                        # MT5持仓格式
-                        symbol = getattr(pos, 'symbol', 'N/A')
-                        type_str = "LONG" if getattr(pos, 'type', 0) == 0 else "SHORT"
-                        volume = getattr(pos, 'volume', 0)
-                        price_open = getattr(pos, 'price_open', 0)
-                        price_current = getattr(pos, 'price_current', 0)
-                        profit = getattr(pos, 'profit', 0)
-                        swap_fee = getattr(pos, 'swap', 0)
-                        
-                        # MT5的volume是手数，1手=100盎司
-                        volume_oz = volume * 100
-                        logger.info(f"   [{i}] {symbol} {type_str}: {volume}手({volume_oz}盎司) | 开仓价: ${price_open:.2f} | 当前价: ${price_current:.2f} | 盈亏: {profit:+.2f} | 隔夜费: {swap_fee:+.2f}")
-                        xau_pnl += profit
+                    append(format_position(i, pos))
                 except (ValueError, TypeError, AttributeError) as e:
                     logger.warning(f"   [{i}] 解析{xau_exchange_name}持仓数据失败: {e}")
-            logger.info(f"   {xau_exchange_name}小计: {xau_pnl:+.2f} USDT")
+            append("   %s小计: %+.2f USDT" % (xau_exchange_name, xau_pnl))
         else:
-            logger.info(f"🔸 {xau_exchange_name} XAUUSD持仓: 无")
+            append("🔸 %s XAUUSD持仓: 无" % xau_exchange_name)
         
         # 显示总计
         total_pnl = binance_pnl + xau_pnl
-        logger.info("-" * 50)
-        logger.info(f"💰 总盈亏: {total_pnl:+.2f} USDT (Binance: {binance_pnl:+.2f} | {xau_exchange_name}: {xau_pnl:+.2f})")
-        close_condition_met = abs(diff) <= Config.CLOSE_PRICE_DIFF
-        logger.info(f'平仓条件: |{diff:.2f}| <= {Config.CLOSE_PRICE_DIFF} → {"✅满足" if close_condition_met else "❌不满足"}')
+        append(separator)
+        append("💰 总盈亏: %+.2f USDT (Binance: %+.2f | %s: %+.2f)" % (total_pnl, binance_pnl, xau_exchange_name, xau_pnl))
+        # 与 should_close_position 使用同一判断（阈值在初始化时读取）
+        close_diff = self._close_diff
+        close_condition_met = -close_diff <= diff <= close_diff
+        append('平仓条件: |%.2f| <= %s → %s' % (diff, self._close_diff_str, "✅满足" if close_condition_met else "❌不满足"))
+        logger.info("\n".join(lines))
     
     @safe_execute("发送定时持仓通知")
-    def _send_scheduled_position_notification(self, paxg_price: float, xauusd_price: float, diff: float) -> None:
-        """发送定时持仓通知到钉钉群"""
+    def _send_scheduled_position_notification(self, paxg_price: float, xauusd_price: float, diff: float,
+                                              now: Optional[datetime] = None,
+                                              binance_positions: Optional[List[Dict[str, Any]]] = None,
+                                              xau_positions: Optional[List[Any]] = None) -> None:
+        """
+        发送定时持仓通知到钉钉群
+        
+        Args:
+            now: 监控循环本轮的时间
+            binance_positions / xau_positions: 监控循环已获取的持仓，未传入时重新获取
+        """
         try:
             if not self.position_notification_enabled or not self.dingtalk_notifier:
                 return
             
-            # 获取当前持仓信息
-            binance_positions = self.binance.get_open_positions()
+            if binance_positions is None or xau_positions is None:
+                # 并发获取当前持仓信息
+                binance_positions, xau_positions = self._fetch_positions()
+            xau_exchange_name = self.xau.name
             
-            # 根据初始化的客户端获取黄金持仓
-            if self.okx:
-                xau_positions = self.okx.get_open_positions()
-                xau_exchange_name = "OKX"
-            elif self.mt5:
-                xau_positions = self.mt5.get_open_positions()
-                xau_exchange_name = "MT5"
-            else:
-                xau_positions = []
-                xau_exchange_name = "未知"
-            
-            # 计算盈亏
-            binance_pnl = 0
-            xau_pnl = 0
-            
-            # 计算Binance盈亏
-            if binance_positions:
-                for pos in binance_positions:
-                    try:
-                        unrealized_pnl = float(pos.get('unRealizedProfit', 0))
-                        binance_pnl += unrealized_pnl
-                    except (ValueError, TypeError):
-                        pass
-            
-            # 计算XAUUSD交易所盈亏
-            if xau_positions:
-                for pos in xau_positions:
-                    try:
-                        if self.okx:
-                            upl = float(pos.get('upl', 0))
-                            xau_pnl += upl
-                        elif self.mt5:
-                            profit = getattr(pos, 'profit', 0)
-                            xau_pnl += profit
-                    except (ValueError, TypeError, AttributeError):
-                        pass
+            # 计算各交易所盈亏
+            binance_pnl = _sum_pnl(binance_positions, _binance_position_pnl)
+            xau_pnl = _sum_pnl(xau_positions, self.xau.get_position_pnl)
             
             total_pnl = binance_pnl + xau_pnl
             
@@ -978,50 +1494,65 @@ class ArbitrageManager:
                 'total_pnl': total_pnl,
                 'binance_pnl': binance_pnl,
                 'xau_pnl': xau_pnl,
-                'timestamp': datetime.now()
+                'timestamp': now or datetime.now()
             }
             
-            # 发送通知
-            results = self.dingtalk_notifier.send_position_notification(position_data)
-            
-            success_count = sum(1 for result in results.values() if result)
-            total_count = len(results)
-            
-            logger.info(f"📱 定时持仓通知已发送: {success_count}/{total_count} 群组成功")
+            # 放入后台队列发送，监控循环不等待钉钉请求
+            self._notify_q.put('position', position_data)
+            logger.info("📱 定时持仓通知已加入发送队列")
             
         except Exception as e:
             logger.error(f"❌ 发送定时持仓通知失败: {e}")
     
-    def _check_and_send_scheduled_notification(self, paxg_price: float, xauusd_price: float, diff: float) -> None:
-        """检查是否需要发送定时推送通知"""
+    @staticmethod
+    def _parse_notification_times(notification_times: List[str]) -> Dict[int, str]:
+        """
+        解析定时推送时间（格式：HH:MM）
+        
+        Returns:
+            当日分钟数 -> 配置的时间字符串，每个时间点前后各允许1分钟误差
+        """
+        minutes: Dict[int, str] = {}
+        for notification_time in notification_times:
+            try:
+                target_hour, target_minute = map(int, notification_time.split(':'))
+            except ValueError as e:
+                logger.warning(f"⚠️ 解析推送时间失败: {notification_time} - {e}")
+                continue
+            target = target_hour * 60 + target_minute
+            # 按当日分钟数取模展开，14:59 可匹配 15:00，23:59 / 00:00 跨零点同样适用
+            for minute in (target - 1, target, target + 1):
+                minutes.setdefault(minute % 1440, notification_time)
+        return minutes
+    
+    def _check_and_send_scheduled_notification(self, paxg_price: float, xauusd_price: float, diff: float,
+                                               now: Optional[datetime] = None,
+                                               binance_positions: Optional[List[Dict[str, Any]]] = None,
+                                               xau_positions: Optional[List[Any]] = None) -> None:
+        """检查是否需要发送定时推送通知（now 与持仓为监控循环本轮已获取的数据）"""
         try:
             if not self.position_notification_enabled or not self.position_notification_times:
                 return
             
-            current_time = datetime.now()
-            current_time_str = current_time.strftime('%H:%M')
-            current_date = current_time.date()
+            # 检查是否在推送时间点（允许1分钟的误差，时间点已在初始化时解析为当日分钟数）
+            if now is None:
+                tm = time.localtime()
+                minute_of_day = tm.tm_hour * 60 + tm.tm_min
+            else:
+                minute_of_day = now.hour * 60 + now.minute
+            notification_time = self._notification_minutes.get(minute_of_day)
+            if notification_time is None:
+                return
             
-            # 检查是否在推送时间点
-            for notification_time in self.position_notification_times:
-                try:
-                    # 解析配置的时间（格式：HH:MM）
-                    target_hour, target_minute = map(int, notification_time.split(':'))
-                    
-                    # 检查当前时间是否匹配（允许1分钟的误差）
-                    if (current_time.hour == target_hour and 
-                        abs(current_time.minute - target_minute) <= 1):
-                        
-                        # 检查今天是否已经推送过
-                        if self.last_notification_date != current_date:
-                            logger.info(f"⏰ 到达定时推送时间: {notification_time}")
-                            self._send_scheduled_position_notification(paxg_price, xauusd_price, diff)
-                            self.last_notification_date = current_date
-                            break  # 一次只推送一个时间点
-                            
-                except ValueError as e:
-                    logger.warning(f"⚠️ 解析推送时间失败: {notification_time} - {e}")
-                    continue
+            # 命中推送时间点后才构造 datetime
+            current_time = now or datetime.now()
+            # 检查今天是否已经推送过
+            current_date = current_time.date()
+            if self.last_notification_date != current_date:
+                logger.info(f"⏰ 到达定时推送时间: {notification_time}")
+                self._send_scheduled_position_notification(paxg_price, xauusd_price, diff, current_time,
+                                                           binance_positions, xau_positions)
+                self.last_notification_date = current_date
                     
         except Exception as e:
             logger.error(f"❌ 检查定时推送失败: {e}")
@@ -1,15 +1,25 @@
+"""
+配置模块 - 全局唯一的配置来源
+
+环境变量只在首次导入时读取一次；各模块统一通过相对导入
+（from ..config import Config）引用同一个模块对象。
+"""
 import os
 from dotenv import load_dotenv, find_dotenv
-import urllib3
-import warnings
-
-# 忽略SSL警告
-urllib3.disable_warnings()
-warnings.filterwarnings('ignore', category=urllib3.exceptions.NotOpenSSLWarning)
 
 # 先加载.env（支持相对路径与父级目录）
 _ = load_dotenv(find_dotenv())
 
+def configure_warnings() -> None:
+    """忽略SSL警告（由程序入口调用一次，导入配置时不再修改全局警告过滤器）"""
+    if getattr(configure_warnings, 'done', False):
+        return
+    import urllib3
+    import warnings
+    urllib3.disable_warnings()
+    warnings.filterwarnings('ignore', category=urllib3.exceptions.NotOpenSSLWarning)
+    configure_warnings.done = True
+
 class Config:
 
     # 统一控制测试网/主网   
@@ -18,6 +28,8 @@ class Config:
     # 代理配置
     USE_PROXY = os.getenv('USE_PROXY', 'false').lower() == 'true'  # 是否使用代理
     PROXY_URL = os.getenv('PROXY_URL', '')  # 代理URL，默认为空
+    HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', 5))  # HTTP请求超时（秒）
+    HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', 4))  # 每个主机保持的长连接数
 
     # 是否使用OKX的XAUUSD
     USE_XAU_OKX = os.getenv('USE_XAU_OKX', 'false').lower() == 'true' 
@@ -40,9 +52,19 @@ class Config:
 
     # 时间间隔
     PRICE_CHECK_INTERVAL = int(os.getenv('PRICE_CHECK_INTERVAL', 10)) 
+    USE_WS_PRICES = os.getenv('USE_WS_PRICES', 'false').lower() == 'true'  # 是否通过WebSocket推送获取价格（不支持代理）
+    USE_WS_POSITIONS = os.getenv('USE_WS_POSITIONS', 'false').lower() == 'true'  # 是否通过用户数据流推送维护Binance持仓（不支持代理）
+    WS_PRICE_MAX_AGE = float(os.getenv('WS_PRICE_MAX_AGE', 3))  # 推送价格最长有效时间（秒），超时回退到REST
+    POSITION_CACHE_TTL = float(os.getenv('POSITION_CACHE_TTL', 1.5))  # 持仓快照缓存时间（秒），同一轮监控内共用
+    STATUS_LINE_EVERY = int(os.getenv('STATUS_LINE_EVERY', 16))  # 终端价格行每N轮刷新一次（价差变号或越过开仓阈值时立即刷新）
+    POSITION_RECONCILE_EVERY = int(os.getenv('POSITION_RECONCILE_EVERY', 6))  # 确认无持仓后每N轮才向交易所核对一次持仓
+    POSITION_DETAIL_EVERY = int(os.getenv('POSITION_DETAIL_EVERY', 30))  # 持仓未变化时每N轮输出一次完整详情
+    BALANCE_CACHE_TTL = float(os.getenv('BALANCE_CACHE_TTL', 300))  # 计算收益率时复用最近一次Binance余额的有效期（秒）
+    PROFIT_CALC_TIMEOUT = float(os.getenv('PROFIT_CALC_TIMEOUT', 10))  # 平仓后等待持仓清空的最长时间（秒），超时仍计算盈利
 
     # 交易时间校验配置
     ENABLE_TRADING_TIME_CHECK = os.getenv('ENABLE_TRADING_TIME_CHECK', 'true').lower() == 'true'  # 是否启用交易时间校验
+    TRADING_STATUS_CACHE_TTL = float(os.getenv('TRADING_STATUS_CACHE_TTL', 30))  # 交易时间检查结果缓存（秒）
 
     # 交易配置  
     MIN_PRICE_DIFF = float(os.getenv('MIN_PRICE_DIFF', 6))  # 开仓阈值
@@ -53,6 +75,10 @@ class Config:
     # 文件配置
     TRADE_LOG_FILE = os.getenv('TRADE_LOG_FILE', 'trades.log')
     DIFF_STATS_FILE = os.getenv('DIFF_STATS_FILE', 'price_diff_stats.log')
+    LOG_ROTATE_INTERVAL = float(os.getenv('LOG_ROTATE_INTERVAL', 0))  # 日志滚动周期（秒），0 表示不滚动（默认），如 3600 为每小时滚动并压缩
+    DIFF_BUFFER_SIZE = int(os.getenv('DIFF_BUFFER_SIZE', 8192))  # 价差环形缓冲区容量（最近N次价差）
+    DIFF_STATS_FLUSH_INTERVAL = float(os.getenv('DIFF_STATS_FLUSH_INTERVAL', 60))  # 价差统计写入间隔（秒）
+    DIFF_LOG_EPSILON = float(os.getenv('DIFF_LOG_EPSILON', 0.01))  # 极值变化小于该值时不写入价差统计
 
     # 交易对配置
     PAXG_SYMBOL = 'PAXGUSDT'
@@ -63,6 +89,8 @@ class Config:
     # 钉钉通知配置
     USE_DINGTALK = os.getenv('USE_DINGTALK', 'true').lower() == 'true'
     DINGTALK_SECRET = os.getenv('DINGTALK_SECRET')
+    DINGTALK_BATCH_WINDOW = float(os.getenv('DINGTALK_BATCH_WINDOW', 0.5))  # 交易通知合并等待窗口（秒），窗口内的通知合并为一条消息
+    DINGTALK_MAX_BATCH = int(os.getenv('DINGTALK_MAX_BATCH', 4))  # 单条消息最多合并的通知数
     
     # 支持多个钉钉群组配置
     DINGTALK_GROUP1_WEBHOOK = os.getenv('DINGTALK_GROUP1_WEBHOOK')
@@ -2,17 +2,24 @@
 钉钉通知模块 - 支持套利交易通知
 """
 import os
+import queue
+import re
+import threading
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import hmac
 import hashlib
 import base64
 import urllib.parse
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Callable, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import logging
 from .config import Config
+from .serialization import dumps
+from .exchanges.xau_adapter import okx_position_fields, mt5_position_fields
 
 # from dotenv import load_dotenv
 
@@ -21,12 +28,35 @@ from .config import Config
 
 logger = logging.getLogger(__name__)
 
+# 钉钉机器人发送频率超限的错误码
+_ERRCODE_RATE_LIMITED = 130101
+
+# 群组webhook配置项名称（DINGTALK_GROUP{序号}_WEBHOOK）
+_GROUP_WEBHOOK_PATTERN = re.compile(r'^DINGTALK_GROUP(\d+)_WEBHOOK$')
+
+# 持仓推送单行模板（模块加载时创建一次，逐个持仓用 % 填充）
+# Binance: (序号, 交易对, 方向, 数量, 开仓价, 标记价, 盈亏)
+_BINANCE_POSITION_LINE = "- [%d] %s %s: %.4f | 开仓: $%.2f | 标记: $%.2f | 盈亏: %+.2f\n"
+# OKX: (序号, 合约, 方向, 张数, 盎司, 开仓价, 标记价, 盈亏)
+_OKX_POSITION_LINE = "- [%d] %s %s: %.0f张(%.3f盎司) | 开仓: $%.2f | 标记: $%.2f | 盈亏: %+.2f\n"
+# MT5: (序号, 交易品种, 方向, 手数, 盎司, 开仓价, 当前价, 盈亏)
+_MT5_POSITION_LINE = "- [%d] %s %s: %s手(%s盎司) | 开仓: $%.2f | 当前: $%.2f | 盈亏: %+.2f\n"
+
 
 class DingTalkNotifier:
     """
     钉钉通知类 - 支持多用户推送
     """
     
+    # 通知类型 -> (消息构建方法名, 通知名称)
+    _BUILDERS = {
+        'open': ('_build_arbitrage_open_message', "开仓通知"),
+        'close': ('_build_arbitrage_close_message', "平仓通知"),
+        'profit': ('_build_arbitrage_profit_message', "盈利汇总通知"),
+        'position': ('_build_position_message', "持仓信息通知"),
+        'simple': ('_build_simple_message', "简单消息"),
+    }
+    
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         初始化钉钉通知器
@@ -35,12 +65,36 @@ class DingTalkNotifier:
             config: 配置字典，如果为None则从环境变量读取
         """
         self.config = config or self._load_config_from_env()
-        self.users = self._load_users_from_env()
+        # webhook地址 -> 群组信息（保持配置顺序）
+        self._groups: Dict[str, Dict[str, Any]] = {
+            group['webhook']: group for group in self._load_users_from_env()
+        }
+        # 签名用 HMAC 对象缓存（按密钥）
+        self._signer: Optional[Any] = None
+        self._signer_secret: Optional[str] = None
+        # 复用HTTP连接，避免每条消息重新握手（连接池按群组数量设置）；
+        # 网络抖动或钉钉返回 429/5xx 时在连接池内退避重试
+        self._session = requests.Session()
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504),
+                        allowed_methods=frozenset({'POST'}), respect_retry_after_header=True,
+                        raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=max(10, len(self._groups)), max_retries=retries)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        self._session.headers.update({'Content-Type': 'application/json'})
+        # 多个群组并发发送，总耗时约等于最慢的一个群组
+        # （群组数量通常只有几个，调用方均为同步线程；线程池复用同一 Session，无需再引入 aiohttp 事件循环）
+        self._executor = ThreadPoolExecutor(max_workers=max(4, len(self._groups)), thread_name_prefix='dingtalk')
         
         # 验证配置
         self._validate_config()
         
-        logger.info(f"钉钉群组通知模块初始化完成，共配置 {len(self.users)} 个群组")
+        logger.info(f"钉钉群组通知模块初始化完成，共配置 {len(self._groups)} 个群组")
+    
+    @property
+    def users(self) -> List[Dict[str, Any]]:
+        """群组列表（快照，遍历期间增删群组不受影响）"""
+        return list(self._groups.values())
     
     def _load_config_from_env(self) -> Dict[str, Any]:
         """从环境变量加载基础配置"""
@@ -53,12 +107,17 @@ class DingTalkNotifier:
         """从环境变量加载群组列表"""
         groups = []
         
-        # 检查环境变量中的群组配置
-        for i in range(1, 11):  # 支持最多10个群组
+        # 扫描配置中的 DINGTALK_GROUP{i}_WEBHOOK，按序号排序
+        indexes = sorted(
+            int(match.group(1))
+            for match in map(_GROUP_WEBHOOK_PATTERN.match, vars(Config))
+            if match
+        )
+        for i in indexes:
             group_webhook = getattr(Config, f'DINGTALK_GROUP{i}_WEBHOOK', '')
-            group_name = getattr(Config, f'DINGTALK_GROUP{i}_NAME', f'群组{i}')
             
             if group_webhook:  # 只有配置了webhook的群组才会被添加
+                group_name = getattr(Config, f'DINGTALK_GROUP{i}_NAME', f'群组{i}')
                 groups.append({
                     'webhook': group_webhook,
                     'name': group_name,
@@ -73,7 +132,7 @@ class DingTalkNotifier:
         if not self.config.get('enabled', True):
             logger.info("钉钉通知已禁用")
         
-        if not self.users:
+        if not self._groups:
             logger.warning("未配置任何群组，通知功能将不可用")
     
     def _get_sign(self, timestamp: str, secret: str) -> str:
@@ -87,52 +146,64 @@ class DingTalkNotifier:
         Returns:
             签名字符串
         """
-        string_to_sign = f'{timestamp}\n{secret}'
-        hmac_code = hmac.new(
-            secret.encode('utf-8'),
-            string_to_sign.encode('utf-8'),
-            digestmod=hashlib.sha256
-        ).digest()
-        sign = urllib.parse.quote_plus(base64.b64encode(hmac_code))
+        # 密钥对应的 HMAC 对象只初始化一次，之后复制使用
+        if self._signer is None or self._signer_secret != secret:
+            self._signer = hmac.new(secret.encode('utf-8'), digestmod=hashlib.sha256)
+            self._signer_secret = secret
+        signer = self._signer.copy()
+        signer.update(f'{timestamp}\n{secret}'.encode('utf-8'))
+        sign = urllib.parse.quote_plus(base64.b64encode(signer.digest()))
         return sign
     
-    def _send_message(self, webhook_url: str, message: Dict[str, Any], user_name: str = "未知用户") -> bool:
+    def _sign_query(self) -> str:
+        """生成签名查询参数（未配置密钥时为空字符串）"""
+        secret = self.config.get('secret', '')
+        if not secret:
+            return ""
+        timestamp = str(round(time.time() * 1000))
+        return f"&timestamp={timestamp}&sign={self._get_sign(timestamp, secret)}"
+    
+    def _send_message(self, webhook_url: str, message: Union[Dict[str, Any], bytes], user_name: str = "未知用户",
+                      sign_query: Optional[str] = None) -> bool:
         """
         发送钉钉消息
         
         Args:
             webhook_url: webhook地址
-            message: 消息内容
+            message: 消息内容（字典，或已序列化的 JSON 字节）
             user_name: 用户名称
+            sign_query: 预先生成的签名参数（群发时所有群组共用），未传入时现场生成
             
         Returns:
             是否发送成功
         """
         try:
-            timestamp = str(round(time.time() * 1000))
-            secret = self.config.get('secret', '')
-            
-            # 如果有密钥，生成签名
-            if secret:
-                sign = self._get_sign(timestamp, secret)
-                webhook_url = f"{webhook_url}&timestamp={timestamp}&sign={sign}"
+            # 如果有密钥，附加签名（签名与群组无关，1小时内有效）
+            if sign_query is None:
+                sign_query = self._sign_query()
             
-            headers = {
-                'Content-Type': 'application/json'
-            }
-            
-            response = requests.post(
-                webhook_url,
-                headers=headers,
-                data=json.dumps(message),
+            response = self._session.post(
+                webhook_url + sign_query,
+                data=message if isinstance(message, bytes) else dumps(message),
                 timeout=10
             )
             
+            # 钉钉业务错误（签名、限流、关键词等）也返回 HTTP 200，只能从响应体的 errcode 判断，
+            # 因此成功响应仍需解析；非 200（重试后仍为 429/5xx）直接判定失败，不再解析错误页面
+            if response.status_code != 200:
+                logger.error(f"向用户 {user_name} 发送钉钉消息失败: HTTP {response.status_code}")
+                return False
+            
             result = response.json()
             
-            if result.get('errcode') == 0:
+            errcode = result.get('errcode')
+            if errcode == 0:
                 logger.info(f"向用户 {user_name} 发送钉钉消息成功")
                 return True
+            elif errcode == _ERRCODE_RATE_LIMITED:
+                # 机器人超过每分钟20条的限制后会被限流一段时间，立即重试只会延长限流
+                logger.warning(f"向用户 {user_name} 发送钉钉消息被限流，本条通知丢弃: {result.get('errmsg')}")
+                return False
             else:
                 logger.error(f"向用户 {user_name} 发送钉钉消息失败: {result}")
                 return False
@@ -141,28 +212,95 @@ class DingTalkNotifier:
             logger.error(f"向用户 {user_name} 发送钉钉消息异常: {str(e)}")
             return False
     
-    def send_arbitrage_open_notification(self, trade_data: Dict[str, Any]) -> Dict[str, bool]:
+    def close(self) -> None:
+        """关闭发送线程池与HTTP连接池"""
+        self._executor.shutdown(wait=True)
+        self._session.close()
+    
+    def _send_to_groups(self, message: Dict[str, Any]) -> Dict[str, bool]:
         """
-        发送套利开仓通知
+        向所有启用的群组并发发送同一条消息
+        
+        Returns:
+            每个启用群组的发送结果字典（按群组配置顺序）
+        """
+        groups = [group for group in self.users if group.get('enabled', True)]
+        if not groups:
+            return {}
+        # 本次群发只签名、序列化一次
+        sign_query = self._sign_query()
+        payload = dumps(message)
+        if len(groups) == 1:
+            # 单个群组直接在当前线程发送
+            group = groups[0]
+            return {group['name']: self._send_message(group['webhook'], payload, group['name'], sign_query)}
+        
+        results = dict.fromkeys((group['name'] for group in groups), False)
+        futures = {}
+        try:
+            for group in groups:
+                future = self._executor.submit(self._send_message, group['webhook'], payload, group['name'], sign_query)
+                futures[future] = group['name']
+        except RuntimeError:
+            # 线程池已关闭（close() 之后或解释器退出阶段），剩余群组在当前线程依次发送
+            for group in groups[len(futures):]:
+                results[group['name']] = self._send_message(group['webhook'], payload, group['name'], sign_query)
+        # _send_message 内部已捕获异常，result() 不会抛出
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+        return results
+    
+    def send_notification(self, kind: str, data: Dict[str, Any]) -> Dict[str, bool]:
+        """
+        按通知类型构建消息并发送到所有群组
         
         Args:
-            trade_data: 交易数据字典
+            kind: 通知类型（open / close / profit / position / simple）
+            data: 通知数据字典
             
         Returns:
             每个群组的发送结果字典
         """
-        results = {}
+        builder_name, action = self._BUILDERS[kind]
+        return self._broadcast(action, getattr(self, builder_name), data)
+    
+    def _broadcast(self, action: str, build: Callable[..., Dict[str, Any]], *args: Any) -> Dict[str, bool]:
+        """
+        构建一次消息并发送到所有群组
         
-        for group in self.users:
-            if group.get('enabled', True):
-                success = self._send_arbitrage_open_to_group(trade_data, group)
-                results[group['name']] = success
-            else:
-                results[group['name']] = False
-                logger.debug(f"群组 {group['name']} 已禁用，跳过通知")
+        Args:
+            action: 通知名称（用于日志）
+            build: 消息构建方法
+            *args: 传给构建方法的参数
+            
+        Returns:
+            每个群组的发送结果字典（已禁用的群组为 False）
+        """
+        results = dict.fromkeys((group['name'] for group in self.users), False)
+        if not self.config.get('enabled', True):
+            return results
         
+        try:
+            message = build(*args)
+        except Exception as e:
+            logger.error(f"构建{action}失败: {str(e)}")
+            return results
+        
+        results.update(self._send_to_groups(message))
         return results
     
+    def send_arbitrage_open_notification(self, trade_data: Dict[str, Any]) -> Dict[str, bool]:
+        """
+        发送套利开仓通知
+        
+        Args:
+            trade_data: 交易数据字典
+            
+        Returns:
+            每个群组的发送结果字典
+        """
+        return self.send_notification('open', trade_data)
+    
     def send_arbitrage_close_notification(self, trade_data: Dict[str, Any]) -> Dict[str, bool]:
         """
         发送套利平仓通知
@@ -173,17 +311,7 @@ class DingTalkNotifier:
         Returns:
             每个群组的发送结果字典
         """
-        results = {}
-        
-        for group in self.users:
-            if group.get('enabled', True):
-                success = self._send_arbitrage_close_to_group(trade_data, group)
-                results[group['name']] = success
-            else:
-                results[group['name']] = False
-                logger.debug(f"群组 {group['name']} 已禁用，跳过通知")
-        
-        return results
+        return self.send_notification('close', trade_data)
     
     def send_arbitrage_profit_notification(self, profit_data: Dict[str, Any]) -> Dict[str, bool]:
         """
@@ -195,56 +323,7 @@ class DingTalkNotifier:
         Returns:
             每个群组的发送结果字典
         """
-        results = {}
-        
-        for group in self.users:
-            if group.get('enabled', True):
-                success = self._send_arbitrage_profit_to_group(profit_data, group)
-                results[group['name']] = success
-            else:
-                results[group['name']] = False
-                logger.debug(f"群组 {group['name']} 已禁用，跳过通知")
-        
-        return results
-    
-    def _send_arbitrage_open_to_group(self, trade_data: Dict[str, Any], group: Dict[str, str]) -> bool:
-        """向指定群组发送开仓通知"""
-        try:
-            if not self.config.get('enabled', True):
-                return False
-            
-            message = self._build_arbitrage_open_message(trade_data)
-            return self._send_message(group['webhook'], message, group['name'])
-                
-        except Exception as e:
-            logger.error(f"向群组 {group['name']} 发送开仓通知失败: {str(e)}")
-            return False
-    
-    def _send_arbitrage_close_to_group(self, trade_data: Dict[str, Any], group: Dict[str, str]) -> bool:
-        """向指定群组发送平仓通知"""
-        try:
-            if not self.config.get('enabled', True):
-                return False
-            
-            message = self._build_arbitrage_close_message(trade_data)
-            return self._send_message(group['webhook'], message, group['name'])
-                
-        except Exception as e:
-            logger.error(f"向群组 {group['name']} 发送平仓通知失败: {str(e)}")
-            return False
-    
-    def _send_arbitrage_profit_to_group(self, profit_data: Dict[str, Any], group: Dict[str, str]) -> bool:
-        """向指定群组发送盈利汇总通知"""
-        try:
-            if not self.config.get('enabled', True):
-                return False
-            
-            message = self._build_arbitrage_profit_message(profit_data)
-            return self._send_message(group['webhook'], message, group['name'])
-                
-        except Exception as e:
-            logger.error(f"向群组 {group['name']} 发送盈利汇总通知失败: {str(e)}")
-            return False
+        return self.send_notification('profit', profit_data)
     
     def _build_arbitrage_open_message(self, trade_data: Dict[str, Any]) -> Dict[str, Any]:
         """构建套利开仓消息"""
@@ -381,17 +460,7 @@ class DingTalkNotifier:
         Returns:
             每个群组的发送结果字典
         """
-        results = {}
-        
-        for group in self.users:
-            if group.get('enabled', True):
-                success = self._send_system_startup_to_group(group)
-                results[group['name']] = success
-            else:
-                results[group['name']] = False
-                logger.debug(f"群组 {group['name']} 已禁用，跳过通知")
-        
-        return results
+        return self._broadcast("启动通知", self._build_system_startup_message)
     
     def send_system_shutdown_notification(self, runtime_info: Dict[str, Any] = None) -> Dict[str, bool]:
         """
@@ -403,56 +472,7 @@ class DingTalkNotifier:
         Returns:
             每个群组的发送结果字典
         """
-        results = {}
-        
-        for group in self.users:
-            if group.get('enabled', True):
-                success = self._send_system_shutdown_to_group(runtime_info or {}, group)
-                results[group['name']] = success
-            else:
-                results[group['name']] = False
-                logger.debug(f"群组 {group['name']} 已禁用，跳过通知")
-        
-        return results
-    
-    def _send_system_startup_to_group(self, group: Dict[str, str]) -> bool:
-        """向指定群组发送启动通知"""
-        try:
-            if not self.config.get('enabled', True):
-                return False
-            
-            message = self._build_system_startup_message()
-            return self._send_message(group['webhook'], message, group['name'])
-                
-        except Exception as e:
-            logger.error(f"向群组 {group['name']} 发送启动通知失败: {str(e)}")
-            return False
-    
-    def _send_system_shutdown_to_group(self, runtime_info: Dict[str, Any], group: Dict[str, str]) -> bool:
-        """向指定群组发送关闭通知"""
-        try:
-            if not self.config.get('enabled', True):
-                return False
-            
-            message = self._build_system_shutdown_message(runtime_info)
-            return self._send_message(group['webhook'], message, group['name'])
-                
-        except Exception as e:
-            logger.error(f"向群组 {group['name']} 发送关闭通知失败: {str(e)}")
-            return False
-    
-    def _send_position_to_group(self, position_data: Dict[str, Any], group: Dict[str, str]) -> bool:
-        """向指定群组发送持仓信息通知"""
-        try:
-            if not self.config.get('enabled', True):
-                return False
-            
-            message = self._build_position_message(position_data)
-            return self._send_message(group['webhook'], message, group['name'])
-                
-        except Exception as e:
-            logger.error(f"向群组 {group['name']} 发送持仓信息通知失败: {str(e)}")
-            return False
+        return self._broadcast("关闭通知", self._build_system_shutdown_message, runtime_info or {})
     
     def _build_system_startup_message(self) -> Dict[str, Any]:
         """构建系统启动消息"""
@@ -563,7 +583,8 @@ class DingTalkNotifier:
             status_emoji = "💤"
             position_status = "无持仓"
         
-        content = f"""
+        # 各段先放入列表，最后一次拼接
+        parts = [f"""
 ## {status_emoji} 持仓状态报告
 
 ### ⏰ 基本信息
@@ -575,11 +596,12 @@ class DingTalkNotifier:
 - **PAXG价格**: ${paxg_price:.2f}
 - **XAUUSD价格**: ${xauusd_price:.2f}
 
-### 📊 持仓详情"""
+### 📊 持仓详情"""]
+        append = parts.append
         
         # Binance持仓信息
         if binance_positions:
-            content += f"\n**🏢 Binance PAXG持仓:**\n"
+            append("\n**🏢 Binance PAXG持仓:**\n")
             for i, pos in enumerate(binance_positions, 1):
                 try:
                     symbol = pos.get('symbol', 'N/A')
@@ -589,44 +611,41 @@ class DingTalkNotifier:
                     mark_price = float(pos.get('markPrice', 0))
                     unrealized_pnl = float(pos.get('unRealizedProfit', 0))
                     
-                    content += f"- [{i}] {symbol} {side}: {abs(size):.4f} | 开仓: ${entry_price:.2f} | 标记: ${mark_price:.2f} | 盈亏: {unrealized_pnl:+.2f}\n"
+                    append(_BINANCE_POSITION_LINE % (i, symbol, side, abs(size), entry_price, mark_price, unrealized_pnl))
                 except (ValueError, TypeError):
-                    content += f"- [{i}] 解析持仓数据失败\n"
+                    append(f"- [{i}] 解析持仓数据失败\n")
         else:
-            content += f"\n**🏢 Binance PAXG持仓:** 无\n"
+            append("\n**🏢 Binance PAXG持仓:** 无\n")
         
         # XAUUSD持仓信息
         if xau_positions:
-            content += f"\n**🏢 {xau_exchange_name} XAUUSD持仓:**\n"
+            append(f"\n**🏢 {xau_exchange_name} XAUUSD持仓:**\n")
             for i, pos in enumerate(xau_positions, 1):
                 try:
                     if xau_exchange_name == "OKX":
-                        inst_id = pos.get('instId', 'N/A')
-                        side = pos.get('posSide', 'N/A')
-                        size = float(pos.get('pos', 0))
-                        avg_px = float(pos.get('avgPx', 0))
-                        mark_px = float(pos.get('markPx', 0))
-                        upl = float(pos.get('upl', 0))
+                        # 与日志显示共用适配器的字段读取（推送中不显示收益率）
+                        inst_id, side, size, avg_px, mark_px, upl, _ = okx_position_fields(pos)
+                        size = float(size)
+                        avg_px = float(avg_px)
+                        mark_px = float(mark_px)
+                        upl = float(upl)
                         
                         size_oz = abs(size) / 1000
-                        content += f"- [{i}] {inst_id} {side}: {abs(size):.0f}张({size_oz:.3f}盎司) | 开仓: ${avg_px:.2f} | 标记: ${mark_px:.2f} | 盈亏: {upl:+.2f}\n"
+                        append(_OKX_POSITION_LINE % (i, inst_id, side, abs(size), size_oz, avg_px, mark_px, upl))
                     else:  # MT5
-                        symbol = getattr(pos, 'symbol', 'N/A')
-                        type_str = "LONG" if getattr(pos, 'type', 0) == 0 else "SHORT"
-                        volume = getattr(pos, 'volume', 0)
-                        price_open = getattr(pos, 'price_open', 0)
-                        price_current = getattr(pos, 'price_current', 0)
-                        profit = getattr(pos, 'profit', 0)
+                        # 与日志显示共用适配器的字段读取（推送中不显示隔夜费）
+                        symbol, pos_type, volume, price_open, price_current, profit, _ = mt5_position_fields(pos)
+                        type_str = "LONG" if pos_type == 0 else "SHORT"
                         
                         volume_oz = volume * 100
-                        content += f"- [{i}] {symbol} {type_str}: {volume}手({volume_oz}盎司) | 开仓: ${price_open:.2f} | 当前: ${price_current:.2f} | 盈亏: {profit:+.2f}\n"
+                        append(_MT5_POSITION_LINE % (i, symbol, type_str, volume, volume_oz, price_open, price_current, profit))
                 except (ValueError, TypeError, AttributeError):
-                    content += f"- [{i}] 解析{xau_exchange_name}持仓数据失败\n"
+                    append(f"- [{i}] 解析{xau_exchange_name}持仓数据失败\n")
         else:
-            content += f"\n**🏢 {xau_exchange_name} XAUUSD持仓:** 无\n"
+            append(f"\n**🏢 {xau_exchange_name} XAUUSD持仓:** 无\n")
         
         # 总盈亏
-        content += f"""
+        append(f"""
 ### 💰 盈亏汇总
 - **Binance盈亏**: {binance_pnl:+.2f} USDT
 - **{xau_exchange_name}盈亏**: {xau_pnl:+.2f} USDT
@@ -635,7 +654,8 @@ class DingTalkNotifier:
 ### 📈 状态分析
 - **盈亏状态**: {'🟢 盈利' if total_pnl > 0 else '🔴 亏损' if total_pnl < 0 else '⚪ 平衡'}
 - **价差状态**: {'⬆️ PAXG高' if current_diff > 0 else '⬇️ PAXG低' if current_diff < 0 else '⚖️ 平衡'}
-        """.strip()
+        """.strip())
+        content = "".join(parts)
         
         return {
             "msgtype": "markdown",
@@ -645,6 +665,28 @@ class DingTalkNotifier:
             }
         }
     
+    def _build_simple_message(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """构建简单消息（markdown 格式，供通知队列合并发送），data 包含 title / content"""
+        title = data['title']
+        # markdown 中单个换行不换行显示，按段落分隔
+        text = f"### {title}\n\n" + data['content'].replace("\n", "\n\n")
+        return {
+            "msgtype": "markdown",
+            "markdown": {
+                "title": title,
+                "text": text
+            }
+        }
+    
+    def _build_text_message(self, title: str, content: str) -> Dict[str, Any]:
+        """构建纯文本消息"""
+        return {
+            "msgtype": "text",
+            "text": {
+                "content": f"{title}\n\n{content}"
+            }
+        }
+    
     def send_simple_message_to_all(self, title: str, content: str) -> Dict[str, bool]:
         """
         向所有群组发送简单消息
@@ -656,17 +698,7 @@ class DingTalkNotifier:
         Returns:
             每个群组的发送结果字典
         """
-        results = {}
-        
-        for group in self.users:
-            if group.get('enabled', True):
-                success = self.send_simple_message_to_group(title, content, group)
-                results[group['name']] = success
-            else:
-                results[group['name']] = False
-                logger.debug(f"群组 {group['name']} 已禁用，跳过通知")
-        
-        return results
+        return self._broadcast("简单消息", self._build_text_message, title, content)
     
     def send_position_notification(self, position_data: Dict[str, Any]) -> Dict[str, bool]:
         """
@@ -688,17 +720,7 @@ class DingTalkNotifier:
         Returns:
             每个群组的发送结果字典
         """
-        results = {}
-        
-        for group in self.users:
-            if group.get('enabled', True):
-                success = self._send_position_to_group(position_data, group)
-                results[group['name']] = success
-            else:
-                results[group['name']] = False
-                logger.debug(f"群组 {group['name']} 已禁用，跳过通知")
-        
-        return results
+        return self.send_notification('position', position_data)
     
     def send_simple_message_to_group(self, title: str, content: str, group: Dict[str, str]) -> bool:
         """
@@ -717,14 +739,7 @@ class DingTalkNotifier:
                 logger.debug("钉钉通知已禁用")
                 return False
             
-            message = {
-                "msgtype": "text",
-                "text": {
-                    "content": f"{title}\n\n{content}"
-                }
-            }
-            
-            return self._send_message(group['webhook'], message, group['name'])
+            return self._send_message(group['webhook'], self._build_text_message(title, content), group['name'])
                 
         except Exception as e:
             logger.error(f"向群组 {group['name']} 发送简单消息失败: {str(e)}")
@@ -743,18 +758,16 @@ class DingTalkNotifier:
         """
         try:
             # 检查群组是否已存在
-            for group in self.users:
-                if group['webhook'] == webhook_url:
-                    logger.warning(f"群组 {group_name} 已存在")
-                    return False
+            if webhook_url in self._groups:
+                logger.warning(f"群组 {group_name} 已存在")
+                return False
             
             # 添加新群组
-            new_group = {
+            self._groups[webhook_url] = {
                 'webhook': webhook_url,
                 'name': group_name,
                 'enabled': True
             }
-            self.users.append(new_group)
             
             logger.info(f"成功添加群组: {group_name}")
             return True
@@ -774,11 +787,10 @@ class DingTalkNotifier:
             是否移除成功
         """
         try:
-            for i, group in enumerate(self.users):
-                if group['webhook'] == webhook_url:
-                    removed_group = self.users.pop(i)
-                    logger.info(f"成功移除群组: {removed_group['name']}")
-                    return True
+            removed_group = self._groups.pop(webhook_url, None)
+            if removed_group is not None:
+                logger.info(f"成功移除群组: {removed_group['name']}")
+                return True
             
             logger.warning(f"未找到webhook: {webhook_url}")
             return False
@@ -798,11 +810,11 @@ class DingTalkNotifier:
             是否启用成功
         """
         try:
-            for group in self.users:
-                if group['webhook'] == webhook_url:
-                    group['enabled'] = True
-                    logger.info(f"成功启用群组: {group['name']}")
-                    return True
+            group = self._groups.get(webhook_url)
+            if group is not None:
+                group['enabled'] = True
+                logger.info(f"成功启用群组: {group['name']}")
+                return True
             
             logger.warning(f"未找到webhook: {webhook_url}")
             return False
@@ -822,11 +834,11 @@ class DingTalkNotifier:
             是否禁用成功
         """
         try:
-            for group in self.users:
-                if group['webhook'] == webhook_url:
-                    group['enabled'] = False
-                    logger.info(f"成功禁用群组: {group['name']}")
-                    return True
+            group = self._groups.get(webhook_url)
+            if group is not None:
+                group['enabled'] = False
+                logger.info(f"成功禁用群组: {group['name']}")
+                return True
             
             logger.warning(f"未找到webhook: {webhook_url}")
             return False
@@ -864,17 +876,10 @@ class DingTalkNotifier:
             logger.info("开始测试钉钉连接...")
             
             # 测试向每个群组发送消息
-            for group in self.users:
-                if group.get('enabled', True):
-                    success = self.send_simple_message_to_group(
-                        "连接测试", 
-                        f"这是一条测试消息，发送时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 
-                        group
-                    )
-                    results[group['name']] = success
-                else:
-                    results[group['name']] = False
-                    logger.debug(f"群组 {group['name']} 已禁用，跳过测试")
+            results = self._broadcast(
+                "连接测试消息", self._build_text_message,
+                "连接测试", f"这是一条测试消息，发送时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+            )
             
             if results:
                 logger.info("钉钉连接测试完成")
@@ -884,4 +889,127 @@ class DingTalkNotifier:
         except Exception as e:
             logger.error(f"钉钉连接测试异常: {str(e)}")
         
-        return results 
\ No newline at end of file
+        return results 
+
+
+class DingTalkQueue:
+    """
+    钉钉通知后台队列
+
+    交易相关通知放入队列后立即返回，由后台线程发送；短时间内连续到达的
+    通知（如平仓通知与随后的盈利汇总）合并为一条 markdown 消息发送。
+    """
+
+    def __init__(self, notifier: DingTalkNotifier, batch_window: float = 0.5, max_batch: int = 4,
+                 maxsize: int = 16):
+        """
+        初始化通知队列
+
+        Args:
+            notifier: 钉钉通知器
+            batch_window: 合并等待窗口（秒）
+            max_batch: 单条消息最多合并的通知数
+            maxsize: 队列容量，已满时丢弃最早的通知
+        """
+        self.notifier = notifier
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="dingtalk-queue", daemon=True)
+        self._thread.start()
+
+    def put(self, kind: str, data: Dict[str, Any]) -> None:
+        """提交一条通知（非阻塞），kind 为 open / close / profit / position / simple"""
+        if self._closed:
+            logger.warning(f"钉钉通知队列已关闭，丢弃通知: {kind}")
+            return
+        if kind not in DingTalkNotifier._BUILDERS:
+            raise ValueError(f"未知的通知类型: {kind}")
+        self._put_evicting((kind, data))
+
+    def _put_evicting(self, item: Any) -> None:
+        """非阻塞入队，队列已满时丢弃最早的通知"""
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                # 钉钉长时间不可用时保留最新的通知
+                try:
+                    dropped = self._queue.get_nowait()
+                except queue.Empty:
+                    continue
+                if dropped is None:
+                    # 结束标记不能被挤出：放回队列，关闭后才到达的通知直接丢弃
+                    if item is not None:
+                        logger.warning(f"钉钉通知队列已关闭，丢弃通知: {item[0]}")
+                    self._put_evicting(None)
+                    return
+                logger.warning(f"钉钉通知队列已满，丢弃最早的通知: {dropped[0]}")
+
+    def _run(self) -> None:
+        """后台发送循环"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            # 在合并窗口内继续收集通知
+            deadline = time.monotonic() + self.batch_window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._send_batch(batch)
+            if stop:
+                return
+
+    def _send_batch(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """构建合并消息并发送到所有启用的群组"""
+        try:
+            if not self.notifier.config.get('enabled', True):
+                return
+            # 逐条构建，单条失败只跳过该条，不影响同批次的其它通知
+            messages = []
+            for kind, data in batch:
+                builder_name, action = self.notifier._BUILDERS[kind]
+                try:
+                    messages.append(getattr(self.notifier, builder_name)(data))
+                except Exception as e:
+                    logger.error(f"构建{action}失败，跳过该通知: {str(e)}")
+            if not messages:
+                return
+            if len(messages) == 1:
+                message = messages[0]
+            else:
+                message = {
+                    "msgtype": "markdown",
+                    "markdown": {
+                        "title": " | ".join(m['markdown']['title'] for m in messages),
+                        "text": "\n\n---\n\n".join(m['markdown']['text'] for m in messages)
+                    }
+                }
+            results = self.notifier._send_to_groups(message)
+            # 发送结果为 bool，直接求和即为成功数
+            logger.info(f"钉钉队列通知已发送（{len(messages)}条合并）: {sum(results.values())}/{len(results)} 群组成功")
+        except Exception as e:
+            logger.error(f"发送钉钉队列通知失败: {str(e)}")
+
+    def close(self, timeout: float = 15.0) -> None:
+        """发送剩余通知并停止后台线程"""
+        if self._closed:
+            return
+        self._closed = True
+        # 结束标记同样非阻塞入队：后台线程卡在重试中时，阻塞的 put 会让关闭流程永远等待
+        self._put_evicting(None)
+        self._thread.join(timeout)
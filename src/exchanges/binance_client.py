@@ -1,6 +1,8 @@
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
-from src.config import Config
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from ..config import Config
 import math
 import time
 from typing import Optional, Dict, List, Tuple, Any
@@ -32,13 +34,16 @@ class BinanceClient:
         self._step_size_cache: Dict[str, float] = {}
         self._last_step_size_update = 0
         self._step_size_cache_ttl = 3600  # 1小时缓存
+        self._position_mode_cache: Optional[bool] = None
+        self._last_position_mode_update = 0
+        self._position_mode_cache_ttl = 300  # 5分钟缓存
         self._initialize_client()
     
     def _initialize_client(self) -> bool:
         """初始化Binance客户端"""
         try:
-            # 设置代理
-            kwargs = {}
+            # 设置代理（所有请求统一超时，避免监控循环被挂起的连接阻塞）
+            kwargs = {'timeout': Config.HTTP_TIMEOUT}
             if Config.USE_PROXY:
                 kwargs['proxies'] = {
                     'http': Config.PROXY_URL,
@@ -52,6 +57,14 @@ class BinanceClient:
                 requests_params=kwargs,
             )
             
+            # 复用长连接（keep-alive），价格轮询不再重复 TCP+TLS 握手；
+            # 连接失败的 GET 请求在连接池内退避重试，下单等 POST 请求不重试
+            retries = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.3,
+                            allowed_methods=frozenset({'GET'}))
+            adapter = HTTPAdapter(pool_connections=Config.HTTP_POOL_SIZE, pool_maxsize=Config.HTTP_POOL_SIZE,
+                                  max_retries=retries)
+            self.client.session.mount('https://', adapter)
+            
             # 根据统一配置决定使用测试网还是主网
             if Config.USE_TESTNET:
                 try:
@@ -156,14 +169,23 @@ class BinanceClient:
 
     @retry_on_error(max_retries=2, delay=0.5)
     def get_position_mode(self) -> bool:
-        """获取持仓模式"""
+        """获取持仓模式（带缓存）"""
         if not self._is_client_ready():
             return False
+        
+        # 检查缓存是否有效
+        current_time = time.time()
+        if (self._position_mode_cache is not None and
+                current_time - self._last_position_mode_update < self._position_mode_cache_ttl):
+            return self._position_mode_cache
             
         try:
             result = self.client.futures_get_position_mode()
             # dualSidePosition: true=对冲持仓模式, false=单向持仓模式
-            return result.get('dualSidePosition', False)
+            is_hedge_mode = result.get('dualSidePosition', False)
+            self._position_mode_cache = is_hedge_mode
+            self._last_position_mode_update = current_time
+            return is_hedge_mode
         except Exception as e:
             print(f"⚠️ 获取持仓模式失败，使用默认值: {e}")
             return False  # 默认为单向持仓模式
@@ -229,20 +251,23 @@ class BinanceClient:
             print(f"❌ 获取Binance合约账户余额时发生未知错误: {e}")
             return None
 
-    @retry_on_error(max_retries=2, delay=0.5)
-    def get_open_positions(self) -> List[Dict[str, Any]]:
-        """获取PAXG持仓"""
+    def query_open_positions(self) -> List[Dict[str, Any]]:
+        """获取PAXG持仓（查询失败时抛出异常，用于必须区分"无持仓"与"查询失败"的场景）"""
         if not self._is_client_ready():
-            return []
-            
+            raise RuntimeError("Binance客户端未初始化")
+        
+        positions = self.client.futures_position_information(symbol=Config.PAXG_SYMBOL)
+        # 只返回有持仓量的PAXG仓位
+        active_positions = [p for p in positions if float(p.get('positionAmt', 0)) != 0]
+        if active_positions:
+            print(f"📊 发现 {len(active_positions)} 个活跃PAXG持仓")
+        
+        return active_positions
+
+    def get_open_positions(self) -> List[Dict[str, Any]]:
+        """获取PAXG持仓（查询失败时返回空列表）"""
         try:
-            positions = self.client.futures_position_information(symbol=Config.PAXG_SYMBOL)
-            # 只返回有持仓量的PAXG仓位
-            active_positions = [p for p in positions if float(p.get('positionAmt', 0)) != 0]
-            if active_positions:
-                print(f"📊 发现 {len(active_positions)} 个活跃PAXG持仓")
-            
-            return active_positions
+            return self.query_open_positions()
         except Exception as e:
             print(f"❌ 获取Binance PAXG持仓失败: {e}")
             return []
@@ -294,13 +319,19 @@ class BinanceClient:
             print(f"❌ 计算Binance已实现盈亏失败: {e}")
             return 0.0, 0
 
-    def close_all_positions(self) -> bool:
-        """市价全平PAXG持仓"""
+    def close_all_positions(self, positions: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """
+        市价全平PAXG持仓
+        
+        Args:
+            positions: 调用方本轮已获取的持仓，传入时不再重复查询
+        """
         if not self._is_client_ready():
             return False
             
         try:
-            positions = self.get_open_positions()
+            if positions is None:
+                positions = self.get_open_positions()
             if not positions:
                 print("✅ Binance无PAXG持仓需要平仓")
                 return True
@@ -314,26 +314,29 @@ class MT5Client:
             print(f"❌ 下单失败: {e}")
             return None
 
-    @retry_on_error(max_retries=2, delay=0.5)
-    def get_open_positions(self) -> List[Any]:
-        """获取XAUUSD持仓"""
+    def query_open_positions(self) -> List[Any]:
+        """获取XAUUSD持仓（查询失败时抛出异常，用于必须区分"无持仓"与"查询失败"的场景）"""
         if not self._is_connected():
             if not self._initialize():
-                return []
-            
+                raise RuntimeError("MT5未连接")
+        
+        # 只获取当前使用的黄金品种的持仓（查询出错时返回 None，无持仓时返回空元组）
+        positions = mt5.positions_get(symbol=self.symbol)
+        if positions is None:
+            raise RuntimeError(f"MT5查询持仓失败: {mt5.last_error()}")
+        
+        # 过滤有效持仓
+        active_positions = [p for p in positions if getattr(p, 'volume', 0) > 0]
+        
+        if active_positions:
+            print(f"📊 发现 {len(active_positions)} 个活跃XAUUSD持仓")
+        
+        return active_positions
+
+    def get_open_positions(self) -> List[Any]:
+        """获取XAUUSD持仓（查询失败时返回空列表）"""
         try:
-            # 只获取当前使用的黄金品种的持仓
-            positions = mt5.positions_get(symbol=self.symbol)
-            if positions is None:
-                return []
-            
-            # 过滤有效持仓
-            active_positions = [p for p in positions if getattr(p, 'volume', 0) > 0]
-            
-            if active_positions:
-                print(f"📊 发现 {len(active_positions)} 个活跃XAUUSD持仓")
-            
-            return active_positions
+            return self.query_open_positions()
         except Exception as e:
             print(f"❌ 获取MT5 XAUUSD持仓失败: {e}")
             return []
@@ -435,13 +438,19 @@ class MT5Client:
         """刷新账户信息"""
         self._get_account_info()
 
-    def close_all_positions(self) -> bool:
-        """市价全平XAUUSD持仓"""
+    def close_all_positions(self, positions: Optional[List[Any]] = None) -> bool:
+        """
+        市价全平XAUUSD持仓
+        
+        Args:
+            positions: 调用方本轮已获取的持仓，传入时不再重复查询
+        """
         if not self._is_connected():
             return False
             
         try:
-            positions = self.get_open_positions()
+            if positions is None:
+                positions = self.get_open_positions()
             if not positions:
                 print("✅ MT5无XAUUSD持仓需要平仓")
                 return True
@@ -87,6 +87,11 @@ class OKXClient:
                 proxy=proxy
             )
             
+            # python-okx 的各 API 对象本身就是启用 HTTP/2 的 httpx.Client，连接自动复用；
+            # 这里只统一请求超时，与 Binance 客户端保持一致
+            for api in (self.market_api, self.trade_api, self.account_api, self.public_api):
+                api.timeout = Config.HTTP_TIMEOUT
+            
             # 测试连接
             self._test_connection()
             
@@ -277,30 +282,32 @@ class OKXClient:
             logger.error(f"❌ 获取OKX账户保证金时发生未知错误: {e}")
             return None
 
-    @retry_on_error(max_retries=2, delay=0.5)
-    def get_open_positions(self) -> List[Dict[str, Any]]:
-        """获取XAUT-USDT持仓"""
+    def query_open_positions(self) -> List[Dict[str, Any]]:
+        """获取XAUT-USDT持仓（查询失败时抛出异常，用于必须区分"无持仓"与"查询失败"的场景）"""
         if not self._is_initialized():
-            return []
-            
+            raise RuntimeError("OKX客户端未初始化")
+        
+        positions = self.account_api.get_positions(instId=Config.OKX_XAUUSD_SYMBOL)
+        
+        if not self._validate_response(positions, "获取持仓信息"):
+            raise RuntimeError(f"OKX获取持仓信息失败: {positions}")
+        
+        # 只返回有持仓量的XAUT-USDT仓位
+        open_positions = []
+        for pos in positions.get('data', []):
+            pos_size = float(pos.get('pos', 0))
+            if pos_size != 0:
+                open_positions.append(pos)
+        
+        if open_positions:
+            logger.info(f"📊 发现 {len(open_positions)} 个活跃XAUT-USDT持仓")
+        
+        return open_positions
+
+    def get_open_positions(self) -> List[Dict[str, Any]]:
+        """获取XAUT-USDT持仓（查询失败时返回空列表）"""
         try:
-            positions = self.account_api.get_positions(instId=Config.OKX_XAUUSD_SYMBOL)
-            
-            if not self._validate_response(positions, "获取持仓信息"):
-                return []
-            
-            # 只返回有持仓量的XAUT-USDT仓位
-            open_positions = []
-            for pos in positions.get('data', []):
-                pos_size = float(pos.get('pos', 0))
-                if pos_size != 0:
-                    open_positions.append(pos)
-            
-            if open_positions:
-                logger.info(f"📊 发现 {len(open_positions)} 个活跃XAUT-USDT持仓")
-            
-            return open_positions
-            
+            return self.query_open_positions()
         except (ValueError, KeyError, TypeError) as e:
             logger.error(f"❌ 解析OKX持仓数据失败: {e}")
             return []
@@ -409,13 +416,19 @@ class OKXClient:
             return 0.0, 0
 
     @retry_on_error(max_retries=2, delay=0.5)
-    def close_all_positions(self) -> bool:
-        """市价全平XAUUSD持仓"""
+    def close_all_positions(self, positions: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """
+        市价全平XAUUSD持仓
+        
+        Args:
+            positions: 调用方本轮已获取的持仓，传入时不再重复查询
+        """
         if not self._is_initialized():
             return False
             
         try:
-            positions = self.get_open_positions()
+            if positions is None:
+                positions = self.get_open_positions()
             if not positions:
                 logger.info("✅ OKX无XAUUSD持仓需要平仓")
                 return True
@@ -0,0 +1,194 @@
+"""
+XAUUSD 交易所适配器 - 统一 OKX / MT5 客户端接口
+
+套利管理器在初始化时选定一个适配器，之后所有 XAUUSD 相关操作
+都通过 self.xau 调用，不再在每个方法里判断 okx / mt5。
+"""
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+from typing import Optional, Dict, Any, Tuple
+from ..config import Config
+from ..ws_price_cache import parse_okx_ticker
+
+# 持仓显示字段（一次取出多个字段）
+_OKX_POSITION_FIELDS = itemgetter('instId', 'posSide', 'pos', 'avgPx', 'markPx', 'upl', 'uplRatio')
+_MT5_POSITION_FIELDS = attrgetter('symbol', 'type', 'volume', 'price_open', 'price_current', 'profit', 'swap')
+
+
+def okx_position_fields(pos: Dict[str, Any]) -> Tuple[Any, ...]:
+    """取出OKX持仓显示字段 (合约, 方向, 张数, 开仓价, 标记价, 盈亏, 收益率)，字段缺失时逐个取默认值"""
+    try:
+        return _OKX_POSITION_FIELDS(pos)
+    except KeyError:
+        return (pos.get('instId', 'N/A'), pos.get('posSide', 'N/A'),
+                *(pos.get(key, 0) for key in ('pos', 'avgPx', 'markPx', 'upl', 'uplRatio')))
+
+
+def mt5_position_fields(pos: Any) -> Tuple[Any, ...]:
+    """取出MT5持仓显示字段 (品种, 类型, 手数, 开仓价, 当前价, 盈亏, 隔夜费)，字段缺失时逐个取默认值"""
+    try:
+        return _MT5_POSITION_FIELDS(pos)
+    except AttributeError:
+        return (getattr(pos, 'symbol', 'N/A'),
+                *(getattr(pos, name, 0) for name in ('type', 'volume', 'price_open', 'price_current', 'profit', 'swap')))
+
+
+@lru_cache(maxsize=64)
+def _format_okx_line(index: int, fields: Tuple[Any, ...]) -> str:
+    """格式化OKX持仓日志行（原始字段未变化时直接复用上次结果）"""
+    inst_id, side, size, avg_px, mark_px, upl, upl_ratio = fields
+    size = float(size)
+    avg_px = float(avg_px)
+    mark_px = float(mark_px)
+    upl = float(upl)
+    upl_ratio = float(upl_ratio) * 100
+
+    # 将张数转换为盎司显示
+    size_oz = abs(size) / 1000
+    return f"   [{index}] {inst_id} {side}: {abs(size):.0f}张({size_oz:.3f}盎司) | 开仓价: ${avg_px:.2f} | 标记价: ${mark_px:.2f} | 盈亏: {upl:+.2f} | ROE: {upl_ratio:+.2f}%"
+
+
+@lru_cache(maxsize=64)
+def _format_mt5_line(index: int, fields: Tuple[Any, ...]) -> str:
+    """格式化MT5持仓日志行（原始字段未变化时直接复用上次结果）"""
+    symbol, pos_type, volume, price_open, price_current, profit, swap_fee = fields
+    type_str = "LONG" if pos_type == 0 else "SHORT"
+
+    # MT5的volume是手数，1手=100盎司
+    volume_oz = volume * 100
+    return f"   [{index}] {symbol} {type_str}: {volume}手({volume_oz}盎司) | 开仓价: ${price_open:.2f} | 当前价: ${price_current:.2f} | 盈亏: {profit:+.2f} | 隔夜费: {swap_fee:+.2f}"
+
+
+class XAUAdapter(ABC):
+    """XAUUSD 交易所适配器基类（子类缺少抽象方法时无法实例化）"""
+
+    name: str = "未知"
+    volume_unit: str = ""
+    balance_currency: str = "USDT"
+    pnl_label: str = "已实现盈亏"
+    strategy_desc: str = ""
+    supports_leverage: bool = False
+
+    def __init__(self, client: Any):
+        self.client = client
+        # 预先绑定客户端方法，热路径直接调用
+        self.get_price = client.get_xauusd_price
+        self.get_open_positions = client.get_open_positions
+        self.query_open_positions = client.query_open_positions
+        self.close_all_positions = client.close_all_positions
+        self.calculate_recent_pnl = client.calculate_recent_pnl
+        self.get_account_balance = client.get_account_balance
+
+    @property
+    def network_desc(self) -> str:
+        """启动日志中显示的网络描述"""
+        return "XAUUSD"
+
+    def place_order(self, side: str, volume: float) -> Optional[Any]:
+        """下单，side 为 'BUY' / 'SELL'"""
+        return self.client.place_xauusd_order(side.lower(), volume)
+
+    def set_leverage(self, leverage: float) -> Optional[Dict[str, Any]]:
+        """设置杠杆（不支持的交易所返回 None）"""
+        return None
+
+    def ticker_stream(self) -> Optional[Tuple[str, Optional[Dict[str, Any]], Any]]:
+        """行情推送配置 (地址, 订阅消息, 解析函数)，无推送接口时返回 None"""
+        return None
+
+    @abstractmethod
+    def volume_from_ounces(self, ounces: float) -> float:
+        """盎司数转换为下单数量"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def ounces_from_volume(self, volume: float) -> float:
+        """下单数量转换为盎司数"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def format_volume(self, volume: float) -> str:
+        """格式化下单数量，如 "10张(0.010盎司)" """
+        raise NotImplementedError
+
+    def get_available_balance(self, balance: Dict[str, Any]) -> Tuple[float, str]:
+        """从余额信息中提取 (可用余额, 币种)"""
+        return balance.get('available_balance', 0), self.balance_currency
+
+    @abstractmethod
+    def get_position_pnl(self, pos: Any) -> float:
+        """获取单个持仓的未实现盈亏"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def format_position(self, index: int, pos: Any) -> str:
+        """格式化单个持仓的日志行"""
+        raise NotImplementedError
+
+
+class OKXAdapter(XAUAdapter):
+    """OKX XAUT-USDT 永续合约（1张 = 0.001盎司）"""
+
+    name = "OKX"
+    volume_unit = "张"
+    balance_currency = "USDT"
+    pnl_label = "手续费"
+    strategy_desc = "OKX(1000张XAUT-USDT=1盎司)"
+    supports_leverage = True
+
+    @property
+    def network_desc(self) -> str:
+        return "模拟盘" if Config.USE_TESTNET else "实盘"
+
+    def set_leverage(self, leverage: float) -> Optional[Dict[str, Any]]:
+        return self.client.set_leverage(Config.OKX_XAUUSD_SYMBOL, leverage)
+
+    def ticker_stream(self) -> Optional[Tuple[str, Optional[Dict[str, Any]], Any]]:
+        url = ("wss://wspap.okx.com:8443/ws/v5/public?brokerId=9999" if Config.USE_TESTNET
+               else "wss://ws.okx.com:8443/ws/v5/public")
+        subscribe = {"op": "subscribe", "args": [{"channel": "tickers", "instId": Config.OKX_XAUUSD_SYMBOL}]}
+        return url, subscribe, parse_okx_ticker
+
+    def volume_from_ounces(self, ounces: float) -> float:
+        return ounces * 1000
+
+    def ounces_from_volume(self, volume: float) -> float:
+        return volume / 1000
+
+    def format_volume(self, volume: float) -> str:
+        return f"{volume:.0f}张({self.ounces_from_volume(volume):.3f}盎司)"
+
+    def get_position_pnl(self, pos: Any) -> float:
+        return float(pos.get('upl', 0))
+
+    def format_position(self, index: int, pos: Any) -> str:
+        return _format_okx_line(index, okx_position_fields(pos))
+
+
+class MT5Adapter(XAUAdapter):
+    """MT5 XAUUSD（1手 = 100盎司）"""
+
+    name = "MT5"
+    volume_unit = "手"
+    balance_currency = "USD"
+    pnl_label = "已实现盈亏"
+    strategy_desc = "MT5(1手XAUUSD=100盎司)"
+
+    def volume_from_ounces(self, ounces: float) -> float:
+        return ounces / 100
+
+    def ounces_from_volume(self, volume: float) -> float:
+        return volume * 100
+
+    def format_volume(self, volume: float) -> str:
+        return f"{volume}手({self.ounces_from_volume(volume)}盎司)"
+
+    def get_available_balance(self, balance: Dict[str, Any]) -> Tuple[float, str]:
+        return balance.get('margin_free', 0), balance.get('currency', self.balance_currency)
+
+    def get_position_pnl(self, pos: Any) -> float:
+        return getattr(pos, 'profit', 0)
+
+    def format_position(self, index: int, pos: Any) -> str:
+        return _format_mt5_line(index, mt5_position_fields(pos))
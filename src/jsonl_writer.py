@@ -0,0 +1,146 @@
+"""
+JSONL 日志写入模块 - 常驻文件描述符 + 后台线程批量追加 + 按周期滚动压缩
+"""
+import gzip
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Any
+from .serialization import dumps_line
+
+logger = logging.getLogger(__name__)
+
+# 后台线程停止标记
+_STOP = object()
+
+
+class JsonlWriter:
+    """
+    JSONL 追加写入器
+
+    文件以 O_APPEND 只打开一次，记录放入队列后由后台线程序列化，
+    队列中积压的记录拼接后一次 os.write 追加，每次写入都是完整的行；
+    调用方（监控循环）不再承担 open/close 与序列化开销。
+    不使用 mmap 预分配文件：进程异常退出时文件尾部会残留空字节，
+    破坏 JSONL 格式，而批量追加已将系统调用降到每批一次。
+    启用滚动后，当前周期的记录写入原文件，周期结束时归档为
+    "<path>.<YYYYmmddHHMM>.gz"，原文件只保留最近一个周期的数据。
+    """
+
+    def __init__(self, path: str, buffer_size: int = 1 << 16, rotate_interval: float = 0):
+        """
+        初始化写入器
+
+        Args:
+            path: 日志文件路径
+            buffer_size: 单次批量写入的最大字节数
+            rotate_interval: 滚动周期（秒），按周期边界对齐，0 表示不滚动
+        """
+        self.path = path
+        self._buffer_size = buffer_size
+        self._rotate_interval = rotate_interval
+        self._next_rotate = self._next_boundary(time.time()) if rotate_interval > 0 else None
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._fd = self._open()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"jsonl-{os.path.basename(path)}",
+            daemon=True
+        )
+        self._thread.start()
+
+    def put(self, record: Any) -> None:
+        """提交一条记录（非阻塞）"""
+        if self._closed:
+            logger.warning(f"⚠️ 写入器已关闭，丢弃记录: {self.path}")
+            return
+        self._queue.put(record)
+
+    def _open(self) -> int:
+        """以追加模式打开日志文件"""
+        return os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def _write(self, buf: bytes) -> None:
+        """写入完整缓冲（处理部分写入）"""
+        view = memoryview(buf)
+        while view:
+            written = os.write(self._fd, view)
+            view = view[written:]
+
+    def _run(self) -> None:
+        """后台写入循环（一次取出队列中积压的记录批量写入）"""
+        while True:
+            batch = [self._queue.get()]
+            size = 0
+            stop = False
+            try:
+                chunks = []
+                while True:
+                    record = batch[-1]
+                    if record is _STOP:
+                        stop = True
+                        break
+                    line = dumps_line(record)
+                    chunks.append(line)
+                    size += len(line)
+                    if size >= self._buffer_size:
+                        break
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if chunks:
+                    if self._next_rotate is not None and time.time() >= self._next_rotate:
+                        self._rotate()
+                    self._write(b''.join(chunks))
+            except Exception as e:
+                logger.warning(f"⚠️ 写入日志文件失败 {self.path}: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _next_boundary(self, now: float) -> float:
+        """下一个滚动时间点（按周期对齐，如整点）"""
+        return (now // self._rotate_interval + 1) * self._rotate_interval
+
+    def _rotate(self) -> None:
+        """归档当前文件并重新打开（在后台线程中执行）"""
+        period_start = self._next_rotate - self._rotate_interval
+        self._next_rotate = self._next_boundary(time.time())
+        os.close(self._fd)
+        try:
+            if os.path.getsize(self.path) > 0:
+                suffix = datetime.fromtimestamp(period_start).strftime('%Y%m%d%H%M')
+                archive = f"{self.path}.{suffix}"
+                os.replace(self.path, archive)
+                with open(archive, 'rb') as src, gzip.open(archive + '.gz', 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(archive)
+        except OSError as e:
+            logger.warning(f"⚠️ 日志文件滚动失败 {self.path}: {e}")
+        finally:
+            self._fd = self._open()
+
+    def flush(self) -> None:
+        """等待队列中的记录全部写入"""
+        if not self._closed:
+            self._queue.join()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """写完剩余记录并关闭文件"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        try:
+            os.close(self._fd)
+        except Exception as e:
+            logger.warning(f"⚠️ 关闭日志文件失败 {self.path}: {e}")
@@ -0,0 +1,164 @@
+"""
+持仓推送模块 - 通过 Binance 合约用户数据流维护 PAXG 持仓快照
+
+连接建立后先用 REST 取一次持仓作为初始快照，之后由 ACCOUNT_UPDATE
+事件更新持仓数量/开仓价，markPrice 推送更新标记价与未实现盈亏；
+监控循环直接读取内存快照，不再每轮请求 positionRisk。
+未同步（连接断开、初始化中）时返回 None，由调用方回退到 REST。
+"""
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+from .serialization import loads
+
+try:
+    import websockets
+except ImportError:  # websockets 为可选依赖
+    websockets = None
+
+logger = logging.getLogger(__name__)
+
+# listenKey 有效期 60 分钟，每 30 分钟延长一次
+_KEEPALIVE_INTERVAL = 1800
+
+
+class BinancePositionStream:
+    """Binance 合约持仓推送快照（单写线程，多读）"""
+
+    def __init__(self, client: Any, symbol: str, ws_base: str,
+                 seed: Callable[[], List[Dict[str, Any]]]):
+        """
+        初始化持仓推送
+
+        Args:
+            client: python-binance Client（用于申请与延长 listenKey）
+            symbol: 合约交易对，如 PAXGUSDT
+            ws_base: 合约 WebSocket 地址，如 wss://fstream.binance.com
+            seed: 获取 REST 持仓快照的函数（连接建立后调用一次）
+        """
+        self.client = client
+        self.symbol = symbol
+        self.ws_base = ws_base.rstrip('/')
+        self._seed = seed
+        # 持仓方向 -> 持仓字典（字段与 REST positionRisk 一致），整体替换，读取无需加锁
+        self._positions: Dict[str, Dict[str, Any]] = {}
+        self._synced = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        """启动后台推送线程，websockets 未安装时返回 False"""
+        if websockets is None:
+            logger.warning("⚠️ 未安装 websockets，使用 REST 获取持仓")
+            return False
+        self._thread = threading.Thread(target=self._run, name="ws-positions", daemon=True)
+        self._thread.start()
+        return True
+
+    def get(self) -> Optional[List[Dict[str, Any]]]:
+        """获取当前有持仓量的仓位，未同步时返回 None"""
+        if not self._synced:
+            return None
+        return [pos for pos in self._positions.values() if float(pos['positionAmt']) != 0]
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """停止推送线程"""
+        self._synced = False
+        if self._loop is not None and self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """推送线程入口（独立事件循环）"""
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._main())
+        finally:
+            self._loop.close()
+
+    async def _main(self) -> None:
+        self._stopping = asyncio.Event()
+        task = asyncio.ensure_future(self._consume())
+        await self._stopping.wait()
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    async def _consume(self) -> None:
+        """订阅用户数据流与标记价格，断线后退避重连"""
+        loop = asyncio.get_running_loop()
+        backoff = 1.0
+        while True:
+            keepalive = None
+            try:
+                listen_key = await loop.run_in_executor(None, self.client.futures_stream_get_listen_key)
+                url = f"{self.ws_base}/stream?streams={listen_key}/{self.symbol.lower()}@markPrice"
+                async with websockets.connect(url, ping_interval=20, ping_timeout=20) as ws:
+                    # 连接建立后再取快照，快照之后的变化都会通过推送到达
+                    self._positions = {pos.get('positionSide', 'BOTH'): pos
+                                       for pos in await loop.run_in_executor(None, self._seed)}
+                    self._synced = True
+                    logger.info("📡 Binance 持仓推送已连接")
+                    backoff = 1.0
+                    keepalive = asyncio.ensure_future(self._keepalive(listen_key))
+                    async for raw in ws:
+                        try:
+                            if not self._handle(loads(raw).get('data') or {}):
+                                break
+                        except (ValueError, KeyError, TypeError, AttributeError) as e:
+                            logger.debug(f"持仓推送消息解析失败: {e}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Binance 持仓推送断开，{backoff:.0f}秒后重连: {e}")
+            finally:
+                self._synced = False
+                if keepalive is not None:
+                    keepalive.cancel()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    async def _keepalive(self, listen_key: str) -> None:
+        """定期延长 listenKey 有效期"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(_KEEPALIVE_INTERVAL)
+            try:
+                await loop.run_in_executor(None, lambda: self.client.futures_stream_keepalive(listen_key))
+            except Exception as e:
+                logger.warning(f"⚠️ 延长 listenKey 失败: {e}")
+
+    def _handle(self, event: Dict[str, Any]) -> bool:
+        """处理单条推送，返回 False 表示需要重新连接"""
+        event_type = event.get('e')
+        if event_type == 'markPriceUpdate':
+            mark = float(event['p'])
+            positions = {}
+            for side, pos in self._positions.items():
+                amount = float(pos['positionAmt'])
+                positions[side] = dict(pos, markPrice=event['p'],
+                                       unRealizedProfit=str(amount * (mark - float(pos['entryPrice']))))
+            self._positions = positions
+        elif event_type == 'ACCOUNT_UPDATE':
+            positions = dict(self._positions)
+            for update in event['a'].get('P', []):
+                if update.get('s') != self.symbol:
+                    continue
+                side = update.get('ps', 'BOTH')
+                previous = positions.get(side, {})
+                positions[side] = {
+                    'symbol': self.symbol,
+                    'positionSide': side,
+                    'positionAmt': update['pa'],
+                    'entryPrice': update['ep'],
+                    'markPrice': previous.get('markPrice', update['ep']),
+                    'unRealizedProfit': update['up'],
+                    # 推送不含强平价格，仓位或保证金变化后旧值已失效，因此不保留（显示为 N/A）
+                }
+            self._positions = positions
+        elif event_type == 'listenKeyExpired':
+            logger.warning("⚠️ listenKey 已过期，重新连接持仓推送")
+            return False
+        return True
@@ -0,0 +1,126 @@
+"""
+价格轮询模块 - 后台线程按固定节奏获取报价，只保留最新一次结果
+"""
+import logging
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (PAXG价格, XAUUSD价格)，获取失败时均为 None
+Quote = Tuple[Optional[float], Optional[float]]
+
+
+class PriceFeed:
+    """
+    后台价格轮询
+
+    价格线程（生产者）按 interval 节奏调用 fetch 并覆盖最新报价，
+    监控循环（消费者）通过 wait_next 取最新报价，交易所请求的耗时
+    不再阻塞开平仓判断；处理慢于轮询时中间的报价直接丢弃。
+    """
+
+    def __init__(self, fetch: Callable[[], Quote], interval: float, stop_event: threading.Event):
+        """
+        初始化价格轮询
+
+        Args:
+            fetch: 获取 (PAXG价格, XAUUSD价格) 的函数
+            interval: 轮询间隔（秒）
+            stop_event: 停止事件，置位后线程退出
+        """
+        self._fetch = fetch
+        self._interval = interval
+        self._stop_event = stop_event
+        self._cond = threading.Condition()
+        self._latest: Optional[Quote] = None
+        self._seq = 0
+        # 每次暂停加一，暂停前开始的请求结果不再发布
+        self._epoch = 0
+        # 未置位时暂停轮询（休市期间）
+        self._active = threading.Event()
+        self._active.set()
+        self._thread = threading.Thread(target=self._run, name="price-feed", daemon=True)
+
+    def start(self) -> None:
+        """启动价格线程"""
+        self._thread.start()
+
+    def pause(self) -> None:
+        """暂停轮询（休市等待期间不请求交易所）"""
+        with self._cond:
+            self._epoch += 1
+        self._active.clear()
+
+    def resume(self) -> int:
+        """
+        恢复轮询
+
+        Returns:
+            当前报价序号，调用方以此作为 last_seq，暂停前的报价不会再被 wait_next 返回
+        """
+        self._active.set()
+        with self._cond:
+            return self._seq
+
+    def _run(self) -> None:
+        """价格线程主循环（按单调时钟固定节奏轮询）"""
+        next_tick = time.monotonic()
+        # 连续超时只在开始时记录一次
+        lagging = False
+        while not self._stop_event.is_set():
+            if not self._active.is_set():
+                self._active.wait(1.0)
+                next_tick = time.monotonic()
+                continue
+
+            epoch = self._epoch
+            try:
+                quote = self._fetch()
+            except Exception as e:
+                logger.warning(f"⚠️ 价格线程获取报价失败: {e}")
+                quote = (None, None)
+
+            with self._cond:
+                # 请求期间发生过暂停时丢弃该报价（可能是休市前的价格）
+                if epoch != self._epoch:
+                    continue
+                self._latest = quote
+                self._seq += 1
+                self._cond.notify_all()
+
+            # 落后超过一轮时重新对齐，不连续补发
+            now = time.monotonic()
+            next_tick += self._interval
+            if next_tick < now:
+                if not lagging:
+                    logger.warning(f"⚠️ 获取报价耗时超过轮询间隔，已重新对齐（落后 {now - next_tick:.2f}秒）")
+                    lagging = True
+                next_tick = now
+            else:
+                lagging = False
+            self._stop_event.wait(next_tick - now)
+
+    def wait_next(self, last_seq: int, timeout: float) -> Tuple[int, Optional[Quote]]:
+        """
+        等待比 last_seq 更新的报价
+
+        Args:
+            last_seq: 上次取到的报价序号
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            (最新序号, 最新报价)，超时或停止时报价为 None
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            # 分段等待，停止事件置位后及时返回
+            while self._seq == last_seq and not self._stop_event.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return last_seq, None
+                self._cond.wait(min(remaining, 0.5))
+            if self._seq == last_seq:
+                return last_seq, None
+            return self._seq, self._latest
@@ -0,0 +1,41 @@
+"""
+日志记录结构 - 交易日志与价差统计的固定字段记录
+
+orjson 直接序列化 dataclass 实例，不需要先构造字典；
+字段顺序即输出的 JSON 键顺序，与原有日志格式保持一致。
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass
+class TradeRecord:
+    """交易日志记录（trades.jsonl）"""
+    trade_id: int
+    timestamp: datetime
+    trade_type: str  # "OPEN" or "CLOSE"
+    action: str
+    paxg_price: float
+    xauusd_price: float
+    price_diff: float
+    binance_position_size: Optional[float]
+    xau_volume: Optional[float]  # 通用的XAUUSD仓位大小（手数或张数）
+    exchange_type: str  # 使用的交易所
+    profit: Optional[float]
+
+
+@dataclass
+class DiffStatsRecord:
+    """价差统计记录（diff_stats.jsonl）"""
+    timestamp: datetime
+    current_diff: float
+    paxg_price: float
+    xauusd_price: float
+    max_diff: float
+    max_diff_time: Optional[datetime]
+    min_diff: float
+    min_diff_time: Optional[datetime]
+    diff_range: float
+    recent_max_diff: Optional[float]
+    recent_min_diff: Optional[float]
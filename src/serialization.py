@@ -0,0 +1,48 @@
+"""
+JSON 序列化工具 - 优先使用 orjson，未安装时回退到标准库 json
+"""
+import dataclasses
+import json
+from datetime import date, datetime
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖
+    orjson = None
+
+
+def _json_default(obj: Any) -> Any:
+    """标准库 json 回退时处理 orjson 原生支持的类型"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if dataclasses.is_dataclass(obj):  # 日志记录结构
+        return dataclasses.asdict(obj)
+    if hasattr(obj, 'tolist'):  # numpy 标量/数组
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """序列化为 UTF-8 JSON 字节（datetime 输出为 ISO 8601 字符串，dataclass 输出为对象）"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, ensure_ascii=False, default=_json_default).encode('utf-8')
+
+
+def dumps_line(obj: Any) -> bytes:
+    """序列化为一行 JSONL（UTF-8 字节）"""
+    if orjson is not None:
+        # 由 orjson 直接追加换行，省去一次 bytes 拼接
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+        )
+    return dumps(obj) + b'\n'
+
+
+def loads(data: Any) -> Any:
+    """解析 JSON（str 或 bytes）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -16,9 +16,9 @@
 - 使用服务器本地时间进行校验
 - 自动处理夏令时变化
 """
-import time
 import logging
 import os
+import threading
 from datetime import datetime, timedelta, timezone
 from typing import Tuple, Optional, Dict
 import pytz
@@ -315,16 +315,19 @@ class TradingTimeManager:
             logger.error(f"❌ 计算距离下次交易时间失败: {e}")
             return None, f"计算失败: {e}"
     
-    def wait_until_trading_time(self, check_interval: int = 60) -> None:
+    def wait_until_trading_time(self, check_interval: int = 60,
+                                stop_event: Optional[threading.Event] = None) -> None:
         """
-        等待直到交易时间开始
+        等待直到交易时间开始（直接等待到下次开盘时间，最长 check_interval 秒后重新计算）
         
         Args:
-            check_interval: 检查间隔（秒）
+            check_interval: 最长检查间隔（秒）
+            stop_event: 停止事件，置位后立即结束等待
         """
         logger.info("⏳ 当前不在交易时间，等待交易开始...")
+        stop_event = stop_event or threading.Event()
         
-        while True:
+        while not stop_event.is_set():
             try:
                 is_trading, status = self.is_trading_time()
                 
@@ -334,8 +337,12 @@ class TradingTimeManager:
                 
                 # 获取下次交易时间和倒计时
                 time_diff, countdown = self.get_time_until_next_trading()
+                wait_seconds = check_interval
                 
                 if time_diff:
+                    # 距离开盘不足一个检查间隔时，只等待到开盘时刻
+                    wait_seconds = min(check_interval, max(time_diff.total_seconds(), 1))
+                    
                     # 显示倒计时
                     total_seconds = int(time_diff.total_seconds())
                     hours = total_seconds // 3600
@@ -349,14 +356,14 @@ class TradingTimeManager:
                     
                     print(f"\r⏰ {status} | 倒计时: {countdown_str}", end="", flush=True)
                 
-                time.sleep(check_interval)
+                stop_event.wait(wait_seconds)
                 
             except KeyboardInterrupt:
                 logger.info("\n⌨️ 用户中断等待")
                 break
             except Exception as e:
                 logger.error(f"❌ 等待交易时间时发生错误: {e}")
-                time.sleep(check_interval)
+                stop_event.wait(check_interval)
     
     def get_trading_schedule_info(self) -> str:
         """
@@ -513,9 +520,10 @@ def is_trading_time() -> Tuple[bool, str]:
     return trading_time_manager.is_trading_time()
 
 
-def wait_until_trading_time(check_interval: int = 60) -> None:
+def wait_until_trading_time(check_interval: int = 60,
+                            stop_event: Optional[threading.Event] = None) -> None:
     """等待直到交易时间开始的便捷函数"""
-    trading_time_manager.wait_until_trading_time(check_interval)
+    trading_time_manager.wait_until_trading_time(check_interval, stop_event)
 
 
 def get_trading_schedule_info() -> str:
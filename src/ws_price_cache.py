@@ -0,0 +1,122 @@
+"""
+WebSocket 价格缓存 - 后台线程订阅交易所行情推送，保存最新价格
+
+监控循环读取缓存中的价格，不再每轮发起 REST 请求；价格超过
+max_age 秒未更新（连接断开、行情不活跃）时返回 None，由调用方回退到 REST。
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from .serialization import dumps, loads
+
+try:
+    import websockets
+except ImportError:  # websockets 为可选依赖
+    websockets = None
+
+logger = logging.getLogger(__name__)
+
+# 行情流配置: (连接地址, 订阅消息（无需订阅时为 None）, 消息解析函数 -> 价格或 None)
+StreamSpec = Tuple[str, Optional[Dict[str, Any]], Callable[[Any], Optional[float]]]
+
+
+def parse_binance_ticker(msg: Any) -> Optional[float]:
+    """解析 Binance 合约 <symbol>@ticker 推送的最新成交价"""
+    price = msg.get('c') if isinstance(msg, dict) else None
+    return float(price) if price else None
+
+
+def parse_okx_ticker(msg: Any) -> Optional[float]:
+    """解析 OKX tickers 频道推送的最新成交价（订阅回执等事件消息返回 None）"""
+    data = msg.get('data') if isinstance(msg, dict) else None
+    if not data:
+        return None
+    price = data[0].get('last')
+    return float(price) if price else None
+
+
+class WSPriceCache:
+    """WebSocket 最新价格缓存（单写线程，多读）"""
+
+    def __init__(self, streams: Dict[str, StreamSpec], max_age: float = 3.0):
+        """
+        初始化价格缓存
+
+        Args:
+            streams: 名称 -> 行情流配置
+            max_age: 价格最长有效时间（秒）
+        """
+        self.streams = streams
+        self.max_age = max_age
+        # 名称 -> (价格, 单调时钟)，整体替换元组，读取无需加锁
+        self._latest: Dict[str, Tuple[float, float]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        """启动后台订阅线程，websockets 未安装时返回 False"""
+        if websockets is None:
+            logger.warning("⚠️ 未安装 websockets，使用 REST 获取价格")
+            return False
+        self._thread = threading.Thread(target=self._run, name="ws-prices", daemon=True)
+        self._thread.start()
+        return True
+
+    def get(self, name: str) -> Optional[float]:
+        """获取最新价格，不存在或已过期时返回 None"""
+        entry = self._latest.get(name)
+        if entry is None or time.monotonic() - entry[1] > self.max_age:
+            return None
+        return entry[0]
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """停止订阅线程"""
+        if self._loop is not None and self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """订阅线程入口（独立事件循环）"""
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._main())
+        finally:
+            self._loop.close()
+
+    async def _main(self) -> None:
+        self._stopping = asyncio.Event()
+        tasks = [asyncio.ensure_future(self._consume(name, spec)) for name, spec in self.streams.items()]
+        await self._stopping.wait()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _consume(self, name: str, spec: StreamSpec) -> None:
+        """订阅单个行情流，断线后退避重连"""
+        url, subscribe, parse = spec
+        backoff = 1.0
+        while True:
+            try:
+                async with websockets.connect(url, ping_interval=20, ping_timeout=20) as ws:
+                    if subscribe is not None:
+                        await ws.send(dumps(subscribe).decode('utf-8'))
+                    logger.info(f"📡 {name} 行情推送已连接")
+                    backoff = 1.0
+                    async for raw in ws:
+                        try:
+                            price = parse(loads(raw))
+                        except (ValueError, KeyError, TypeError, IndexError) as e:
+                            logger.debug(f"{name} 行情消息解析失败: {e}")
+                            continue
+                        if price is not None and price > 0:
+                            self._latest[name] = (price, time.monotonic())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ {name} 行情推送断开，{backoff:.0f}秒后重连: {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)